@@ -0,0 +1,10 @@
+"""
+Exemplos dos padrões de criação.
+
+Os scripts que importam vizinhos (ou os módulos comuns, como repr_mixin.py e
+factory/product_cache.py) rodam como módulos do pacote, a partir de
+DesignPatterns/codings:
+
+    python -m creational.builder.user_batch
+    python -m creational.factory.load_generator -n 100000
+"""
@@ -11,14 +11,12 @@ Geralmente o builder aceita o encadeamento de métodos (method chaining).
 
 from abc import ABC, abstractmethod
 
+from ..repr_mixin import StringReprMixin
 
-class StringReprMixing:
-    def __str__(self) -> str:
-        params = ', '.join([f"{k}={v}" for k, v in self.__dict__.items()])
-        return f"{self.__class__.__name__} ({params})"
 
-    def __repr__(self) -> str:
-        return self.__str__()
+class StringReprMixing(StringReprMixin):
+    __slots__ = ()
+    _repr_separador = ' '
 
 
 class User(StringReprMixing):
@@ -0,0 +1,146 @@
+"""
+Construção em lote para o Builder.
+
+O UserBuilder fluente cria um User por vez: uma chamada de método por passo
+e um objeto com __dict__ e duas listas vazias por usuário. Para importações
+em massa isso domina o tempo, então aqui temos:
+
+    . SlottedUser: mesmo formato de User, mas com __slots__ (sem __dict__)
+
+    . UserBatchBuilder.build: constrói N usuários a partir de colunas
+    (firstnames, lastnames, ages, ...) em uma única chamada
+
+    . UserBatchBuilder.build_batch: devolve um UserBatch colunar, que só
+    materializa um SlottedUser quando uma linha é acessada (uma fatia,
+    como em listas, devolve outro UserBatch)
+"""
+
+from itertools import repeat
+
+from .builder import StringReprMixing, UserBuilder
+
+
+class SlottedUser(StringReprMixing):
+    __slots__ = ('firstname', 'lastname', 'age', 'phone_numbers', 'addresses')
+
+    def __init__(self, firstname=None, lastname=None, age=None,
+                 phone_numbers=None, addresses=None):
+        self.firstname = firstname
+        self.lastname = lastname
+        self.age = age
+        self.phone_numbers = [] if phone_numbers is None else phone_numbers
+        self.addresses = [] if addresses is None else addresses
+
+
+def _coluna(valores, tamanho):
+    if valores is None:
+        return repeat(None, tamanho)
+    if len(valores) != tamanho:
+        raise ValueError('Todas as colunas precisam ter o mesmo tamanho')
+    return valores
+
+
+class UserBatch:
+    """Usuários guardados por coluna (uma lista por atributo)."""
+
+    __slots__ = SlottedUser.__slots__
+
+    def __init__(self, firstname, lastname, age, phone_numbers, addresses):
+        self.firstname = firstname
+        self.lastname = lastname
+        self.age = age
+        self.phone_numbers = phone_numbers
+        self.addresses = addresses
+
+    def __len__(self):
+        return len(self.firstname)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return UserBatch(self.firstname[i], self.lastname[i],
+                             self.age[i], self.phone_numbers[i],
+                             self.addresses[i])
+        return SlottedUser(self.firstname[i], self.lastname[i], self.age[i],
+                           self.phone_numbers[i], self.addresses[i])
+
+    def __iter__(self):
+        return map(SlottedUser, self.firstname, self.lastname, self.age,
+                   self.phone_numbers, self.addresses)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__} ({len(self)} users)"
+
+
+class UserBatchBuilder:
+    @staticmethod
+    def _colunas(firstnames, lastnames, ages, phones, addresses):
+        tamanho = len(firstnames)
+        lastnames = _coluna(lastnames, tamanho)
+        ages = _coluna(ages, tamanho)
+        # Cada usuário recebe listas próprias, como no UserBuilder
+        phones = [[] if p is None else list(p)
+                  for p in _coluna(phones, tamanho)]
+        addresses = [[] if a is None else list(a)
+                     for a in _coluna(addresses, tamanho)]
+        return firstnames, lastnames, ages, phones, addresses
+
+    def build(self, firstnames, lastnames=None, ages=None, phones=None,
+              addresses=None):
+        return list(map(SlottedUser, *self._colunas(
+            firstnames, lastnames, ages, phones, addresses
+        )))
+
+    def build_batch(self, firstnames, lastnames=None, ages=None, phones=None,
+                    addresses=None):
+        return UserBatch(*(list(c) for c in self._colunas(
+            firstnames, lastnames, ages, phones, addresses
+        )))
+
+
+def _benchmark(n=200_000):
+    from time import perf_counter
+
+    firstnames = [f"Nome{i}" for i in range(n)]
+    lastnames = [f"Sobrenome{i}" for i in range(n)]
+    ages = [i % 90 for i in range(n)]
+
+    t0 = perf_counter()
+    builder = UserBuilder()
+    fluentes = [
+        builder.add_firstname(f).add_lastname(s).add_age(a).result
+        for f, s, a in zip(firstnames, lastnames, ages)
+    ]
+    t_fluente = perf_counter() - t0
+
+    t0 = perf_counter()
+    lote = UserBatchBuilder().build(firstnames, lastnames, ages)
+    t_lote = perf_counter() - t0
+
+    t0 = perf_counter()
+    colunar = UserBatchBuilder().build_batch(firstnames, lastnames, ages)
+    t_colunar = perf_counter() - t0
+
+    assert len(fluentes) == len(lote) == len(colunar) == n
+    print(f"{n} usuários")
+    print(f"UserBuilder fluente:           {t_fluente:.3f}s")
+    print(f"UserBatchBuilder.build:        {t_lote:.3f}s")
+    print(f"UserBatchBuilder.build_batch:  {t_colunar:.3f}s")
+
+
+if __name__ == "__main__":
+    batch_builder = UserBatchBuilder()
+
+    users = batch_builder.build(
+        ["João", "Maikin"], ["Justino", "Santos"], [21, None],
+        addresses=[None, ["Rua X - N°: 321"]],
+    )
+    print(users)
+
+    batch = batch_builder.build_batch(["Ana", "Bia"], ["Silva", "Souza"])
+    print(batch, batch[1])
+    fatia = batch[1:]
+    assert isinstance(fatia, UserBatch) and len(fatia) == 1
+    assert fatia[0].firstname == "Bia" and batch[::-1][1].firstname == "Ana"
+    print(fatia, list(fatia))
+
+    _benchmark()
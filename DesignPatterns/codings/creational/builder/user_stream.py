@@ -0,0 +1,145 @@
+"""
+Director em streaming para o Builder.
+
+O UserDirector monta um usuário por chamada a partir de argumentos
+posicionais. O StreamingUserDirector lê um arquivo CSV ou JSONL de forma
+preguiçosa e aplica, para cada linha, uma receita declarativa que diz qual
+passo do builder recebe qual coluna:
+
+    receita = [
+        ('add_firstname', 'nome'),
+        ('add_lastname', 'sobrenome'),
+        ('add_age', 'idade', int),      # conversor opcional
+        ('add_phone', 'telefone'),
+        ('add_phone', 'celular'),       # o mesmo passo pode se repetir
+    ]
+
+Os usuários são produzidos por um gerador (um a um ou em lotes), então a
+memória fica constante independente do tamanho do arquivo. Colunas ausentes
+ou vazias simplesmente não geram o passo correspondente. Se um conversor
+falhar no meio de uma linha, o builder é zerado antes de a exceção subir.
+"""
+
+import csv
+import json
+import os
+from itertools import islice
+
+from .builder import UserBuilder, UserDirector
+
+
+class StreamingUserDirector(UserDirector):
+    def _compila(self, receita):
+        passos = []
+        for passo in receita:
+            metodo, coluna, *conversor = passo
+            passos.append((
+                getattr(self._builder, metodo), coluna,
+                conversor[0] if conversor else None,
+            ))
+        return passos
+
+    def _monta(self, linhas, receita):
+        passos = self._compila(receita)
+        builder = self._builder
+        for linha in linhas:
+            try:
+                for metodo, coluna, conversor in passos:
+                    valor = linha.get(coluna)
+                    if valor is None or valor == '':
+                        continue
+                    metodo(valor if conversor is None else conversor(valor))
+            except Exception:
+                # Não deixa a linha pela metade no builder compartilhado
+                builder.reset()
+                raise
+            yield builder.result
+
+    @staticmethod
+    def _em_lotes(usuarios, batch_size):
+        if batch_size is None:
+            return usuarios
+        if batch_size < 1:
+            raise ValueError('batch_size deve ser >= 1')
+        return iter(lambda: list(islice(usuarios, batch_size)), [])
+
+    def from_csv(self, caminho, receita, batch_size=None, **csv_kwargs):
+        with open(caminho, newline='', encoding='utf-8') as arquivo:
+            linhas = csv.DictReader(arquivo, **csv_kwargs)
+            yield from self._em_lotes(self._monta(linhas, receita),
+                                      batch_size)
+
+    def from_jsonl(self, caminho, receita, batch_size=None):
+        with open(caminho, encoding='utf-8') as arquivo:
+            linhas = (json.loads(linha) for linha in arquivo if linha.strip())
+            yield from self._em_lotes(self._monta(linhas, receita),
+                                      batch_size)
+
+
+RECEITA_EXEMPLO = [
+    ('add_firstname', 'nome'),
+    ('add_lastname', 'sobrenome'),
+    ('add_age', 'idade', int),
+    ('add_phone', 'telefone'),
+    ('add_address', 'endereco'),
+]
+
+
+def _gera_csv(caminho, linhas):
+    with open(caminho, 'w', newline='', encoding='utf-8') as arquivo:
+        escritor = csv.writer(arquivo)
+        escritor.writerow(['nome', 'sobrenome', 'idade', 'telefone',
+                           'endereco'])
+        escritor.writerows(
+            (f'Nome{i}', f'Sobrenome{i}', i % 90,
+             f'9{i:08d}' if i % 2 else '', f'Rua {i % 500} - N°: {i}')
+            for i in range(linhas)
+        )
+
+
+def _benchmark(linhas=500_000):
+    import resource
+    import tempfile
+    from time import perf_counter
+
+    director = StreamingUserDirector(UserBuilder())
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, 'users.csv')
+        _gera_csv(caminho, linhas)
+
+        t0 = perf_counter()
+        total = sum(len(lote) for lote in director.from_csv(
+            caminho, RECEITA_EXEMPLO, batch_size=10_000
+        ))
+        dt = perf_counter() - t0
+
+    # ru_maxrss em KiB no Linux; deve ficar estável ao aumentar `linhas`
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f'{total} usuários em {dt:.2f}s ({total / dt:,.0f} usuários/s), '
+          f'pico de RSS {pico:.0f} MB')
+
+
+if __name__ == "__main__":
+    import sys
+    import tempfile
+
+    with tempfile.NamedTemporaryFile('w', suffix='.jsonl', encoding='utf-8',
+                                     delete=False) as arquivo:
+        arquivo.write('{"nome": "João", "sobrenome": "Justino", '
+                      '"idade": 21}\n')
+        arquivo.write('{"nome": "Maikin", "sobrenome": "Santos", '
+                      '"endereco": "Rua X - N°: 321"}\n')
+        arquivo.write('{"nome": "Erro", "telefone": "1", "idade": "x"}\n')
+
+    director = StreamingUserDirector(UserBuilder())
+    try:
+        for user in director.from_jsonl(arquivo.name, RECEITA_EXEMPLO):
+            print(user)
+    except ValueError as erro:
+        print('linha inválida:', erro)
+    os.remove(arquivo.name)
+    # A linha que falhou não vaza para o próximo usuário do director
+    print(director.with_age('Ana', 'Lima', 30))
+
+    # Ex.: `python -m creational.builder.user_stream 10000000` (10M linhas)
+    _benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 500_000)
@@ -0,0 +1,306 @@
+"""
+Motor de atribuição em lote: pedidos x veículos
+
+Em vez de atender um buscar_cliente por vez, o motor recebe uma janela de
+pedidos pendentes (pontos de embarque) e a frota montada pelas fábricas da
+Abstract Factory e devolve uma atribuição global que tenta minimizar a
+distância total até os embarques:
+
+    . 'guloso': todos os pares (distância, pedido, veículo) vão para um heap
+    e saem do menor para o maior; o par é aceito se pedido e veículo ainda
+    estiverem livres. Com um FrotaIndex (spatial_index.py) cada pedido só
+    considera os `candidatos` veículos mais próximos, e os que sobrarem sem
+    veículo ganham uma segunda passada com a frota livre inteira
+
+    . 'otimo': algoritmo húngaro (Kuhn-Munkres com potenciais, O(n² m)),
+    que acha o mínimo exato; serve para janelas pequenas
+
+    . 'auto': ótimo até `limite_otimo` pedidos, guloso acima disso
+
+A matriz de custos é uma lista de listas em Python puro (NumPy não está
+disponível aqui).
+"""
+from heapq import heapify, heappop
+from math import hypot, inf
+
+from .abstract_factory import ZonaNorteVeiculoFactory, ZonaSulVeiculoFactory
+from .spatial_index import FrotaIndex
+
+
+class VeiculoNaFrota:
+    __slots__ = ('veiculo', 'x', 'y')
+
+    def __init__(self, veiculo, x, y) -> None:
+        self.veiculo = veiculo
+        self.x = x
+        self.y = y
+
+
+def matriz_de_custos(pedidos, frota):
+    return [[hypot(v.x - px, v.y - py) for v in frota] for px, py in pedidos]
+
+
+def hungaro(custo):
+    """
+    Atribuição de custo mínimo para uma matriz n x m. Devolve, para cada
+    linha, a coluna escolhida (ou -1 se houver mais linhas que colunas).
+    """
+    n = len(custo)
+    m = len(custo[0]) if n else 0
+    if n > m:
+        transposta = hungaro([list(coluna) for coluna in zip(*custo)])
+        atribuicao = [-1] * n
+        for j, i in enumerate(transposta):
+            atribuicao[i] = j
+        return atribuicao
+
+    # Índices a partir de 1; a coluna 0 é a raiz fictícia
+    u = [0.0] * (n + 1)
+    v = [0.0] * (m + 1)
+    dono = [0] * (m + 1)     # dono[j] = linha atribuída à coluna j
+    caminho = [0] * (m + 1)
+    colunas = range(1, m + 1)
+    for i in range(1, n + 1):
+        dono[0] = i
+        j0 = 0
+        minimo = [inf] * (m + 1)
+        usada = [False] * (m + 1)
+        while True:
+            usada[j0] = True
+            i0 = dono[j0]
+            linha = custo[i0 - 1]
+            ui0 = u[i0]
+            delta = inf
+            j1 = 0
+            for j in colunas:
+                if not usada[j]:
+                    atual = linha[j - 1] - ui0 - v[j]
+                    if atual < minimo[j]:
+                        minimo[j] = atual
+                        caminho[j] = j0
+                    if minimo[j] < delta:
+                        delta = minimo[j]
+                        j1 = j
+            for j in range(m + 1):
+                if usada[j]:
+                    u[dono[j]] += delta
+                    v[j] -= delta
+                else:
+                    minimo[j] -= delta
+            j0 = j1
+            if dono[j0] == 0:
+                break
+        while j0:
+            j1 = caminho[j0]
+            dono[j0] = dono[j1]
+            j0 = j1
+
+    atribuicao = [-1] * n
+    for j in colunas:
+        if dono[j]:
+            atribuicao[dono[j] - 1] = j - 1
+    return atribuicao
+
+
+def guloso(pedidos, frota, indice=None, candidatos=8):
+    atribuicao = [-1] * len(pedidos)
+    ocupados = set()
+
+    def consome(pares):
+        heapify(pares)
+        while pares:
+            _, i, j = heappop(pares)
+            if atribuicao[i] == -1 and j not in ocupados:
+                atribuicao[i] = j
+                ocupados.add(j)
+
+    if indice is not None:
+        pares = []
+        for i, (px, py) in enumerate(pedidos):
+            for d, j in indice.k_mais_proximos(px, py, candidatos):
+                pares.append((d, i, j))
+        consome(pares)
+
+    # Segunda passada (ou única, sem índice): frota livre inteira. Com
+    # índice, só contam os veículos que ele ainda marca como disponíveis
+    pendentes = [i for i, j in enumerate(atribuicao) if j == -1]
+    if indice is None:
+        livres = [j for j in range(len(frota)) if j not in ocupados]
+    else:
+        livres = sorted(indice.disponiveis() - ocupados)
+    if pendentes and livres:
+        consome([
+            (hypot(frota[j].x - pedidos[i][0], frota[j].y - pedidos[i][1]),
+             i, j)
+            for i in pendentes for j in livres
+        ])
+    return atribuicao
+
+
+class MotorAtribuicao:
+    def __init__(self, frota, modo='auto', limite_otimo=60,
+                 candidatos=8) -> None:
+        if modo not in ('auto', 'guloso', 'otimo'):
+            raise ValueError(f'Modo {modo!r} inválido')
+        self.frota = list(frota)
+        self.modo = modo
+        self.limite_otimo = limite_otimo
+        self.candidatos = candidatos
+        self._indices = {id(v): j for j, v in enumerate(self.frota)}
+        self.indice = FrotaIndex()
+        for j, v in enumerate(self.frota):
+            self.indice.atualiza(j, v.x, v.y)
+
+    def move(self, j, x, y) -> None:
+        """Nova posição; um veículo atribuído continua indisponível."""
+        self.frota[j].x = x
+        self.frota[j].y = y
+        self.indice.atualiza(j, x, y)
+
+    def atribui(self, pedidos, modo=None):
+        """
+        Devolve (pares, distância total); pares são (pedido, VeiculoNaFrota).
+        Os veículos atribuídos ficam indisponíveis no índice até serem
+        liberados com libera().
+        """
+        modo = modo or self.modo
+        if modo == 'auto':
+            modo = 'otimo' if len(pedidos) <= self.limite_otimo else 'guloso'
+        if modo == 'otimo':
+            # Colunas só dos veículos livres; depois volta ao índice da frota
+            livres = sorted(self.indice.disponiveis())
+            colunas = hungaro(matriz_de_custos(
+                pedidos, [self.frota[j] for j in livres]
+            ))
+            atribuicao = [livres[c] if c != -1 else -1 for c in colunas]
+        else:
+            atribuicao = guloso(pedidos, self.frota, self.indice,
+                                self.candidatos)
+
+        pares = []
+        total = 0.0
+        for i, j in enumerate(atribuicao):
+            if j == -1:
+                continue
+            veiculo = self.frota[j]
+            px, py = pedidos[i]
+            total += hypot(veiculo.x - px, veiculo.y - py)
+            pares.append((i, veiculo))
+            self.indice.marca_disponivel(j, False)
+        return pares, total
+
+    def libera(self, pares) -> None:
+        for _, veiculo in pares:
+            self.indice.marca_disponivel(self._indices[id(veiculo)], True)
+
+
+def monta_frota(n, rng, lado=10_000):
+    """Metade norte (ZN) e metade sul (ZS), das quatro famílias."""
+    frota = []
+    for factory, y0 in ((ZonaNorteVeiculoFactory(), lado / 2),
+                        (ZonaSulVeiculoFactory(), 0)):
+        familias = (factory.get_carro_popular, factory.get_carro_luxo,
+                    factory.get_moto_popular, factory.get_moto_luxo)
+        for i in range(n // 2):
+            frota.append(VeiculoNaFrota(
+                familias[i % 4](), rng.uniform(0, lado),
+                y0 + rng.uniform(0, lado / 2),
+            ))
+    return frota
+
+
+def _benchmark():
+    from random import Random
+    from time import perf_counter
+
+    print(f'{"janela":>6} {"frota":>6} {"guloso":>10} {"ótimo":>10} '
+          f'{"custo guloso / ótimo":>21}')
+    for janela in (10, 25, 50, 100, 200, 400, 800):
+        rng = Random(janela)
+        motor = MotorAtribuicao(monta_frota(janela * 2, rng))
+        pedidos = [(rng.uniform(0, 10_000), rng.uniform(0, 10_000))
+                   for _ in range(janela)]
+
+        t0 = perf_counter()
+        _, custo_guloso = motor.atribui(pedidos, 'guloso')
+        tempo_guloso = perf_counter() - t0
+        motor = MotorAtribuicao(motor.frota)  # frota livre de novo
+
+        if janela <= 400:
+            t0 = perf_counter()
+            _, custo_otimo = motor.atribui(pedidos, 'otimo')
+            tempo_otimo = perf_counter() - t0
+            razao = f'{custo_guloso / custo_otimo:.3f}'
+            otimo = f'{tempo_otimo * 1000:.1f}ms'
+        else:
+            razao = otimo = '-'
+        print(f'{janela:>6} {janela * 2:>6} {tempo_guloso * 1000:>8.1f}ms '
+              f'{otimo:>10} {razao:>21}')
+
+
+def _verifica():
+    """
+    Confere o húngaro contra a força bruta em matrizes pequenas e que duas
+    janelas seguidas, sem libera(), não repetem veículos.
+    """
+    from itertools import permutations
+    from random import Random
+
+    rng = Random(7)
+    for n, m in ((3, 3), (4, 6), (6, 4), (5, 5)):
+        custo = [[rng.randint(0, 50) for _ in range(m)] for _ in range(n)]
+        atribuicao = hungaro(custo)
+        obtido = sum(custo[i][j] for i, j in enumerate(atribuicao) if j >= 0)
+        if n <= m:
+            melhor = min(sum(custo[i][p[i]] for i in range(n))
+                         for p in permutations(range(m), n))
+        else:
+            melhor = min(sum(custo[p[j]][j] for j in range(m))
+                         for p in permutations(range(n), m))
+        assert obtido == melhor, (n, m, obtido, melhor)
+    print('húngaro conferido com força bruta')
+
+    for modo in ('otimo', 'guloso'):
+        motor = MotorAtribuicao(monta_frota(8, rng), modo=modo, candidatos=2)
+        pedidos = [(1_000, 9_000), (9_000, 1_000), (5_000, 5_000)]
+        usados = set()
+        for _ in range(2):
+            pares, _ = motor.atribui(pedidos)
+            ids = {id(veiculo) for _, veiculo in pares}
+            assert len(pares) == len(pedidos), (modo, pares)
+            assert not ids & usados, modo
+            usados |= ids
+        pares, _ = motor.atribui(pedidos)  # sobram só 2 veículos
+        assert len(pares) == 2 and not {id(v) for _, v in pares} & usados
+        motor.libera(pares)
+        pares, _ = motor.atribui(pedidos[:1])
+        assert len(pares) == 1
+
+        # Mover um veículo ocupado não o devolve para a frota livre
+        motor = MotorAtribuicao(monta_frota(8, rng), modo=modo, candidatos=2)
+        pares, _ = motor.atribui(pedidos[:1])
+        ocupado = pares[0][1]
+        j = motor.frota.index(ocupado)
+        motor.move(j, *pedidos[1])
+        pares, _ = motor.atribui(pedidos[1:2])
+        assert pares[0][1] is not ocupado, modo
+        assert not motor.indice.disponivel(j)
+    print('janelas seguidas não repetem veículos')
+
+
+if __name__ == "__main__":
+    from random import Random
+
+    rng = Random(0)
+    motor = MotorAtribuicao(monta_frota(8, rng))
+    pedidos = [(1_000, 9_000), (9_000, 1_000), (5_000, 5_000)]
+    pares, total = motor.atribui(pedidos)
+    for i, veiculo in pares:
+        print(pedidos[i], '->', (round(veiculo.x), round(veiculo.y)),
+              type(veiculo.veiculo).__name__)
+        veiculo.veiculo.buscar_cliente()
+    print(f'distância total: {total:.0f}')
+    motor.libera(pares)
+
+    _verifica()
+    _benchmark()
@@ -0,0 +1,227 @@
+"""
+Despacho assíncrono e concorrente do Cliente.busca_clientes
+
+O Cliente do abstract_factory.py visita uma zona por vez e chama
+buscar_cliente de cada veículo em sequência: a latência total é a soma de
+todas as buscas. O AsyncDispatcher dispara as buscas de todas as zonas e de
+todas as famílias de veículos ao mesmo tempo:
+
+    . cada zona tem um asyncio.Semaphore: no máximo `limite_por_zona`
+    buscas da mesma zona rodam juntas
+
+    . cada busca tem um timeout; a que estoura vira o resultado 'timeout'
+    sem derrubar as outras, e cancelar busca_clientes cancela todas
+
+    . veículos com `async def buscar_cliente` são aguardados direto; os
+    síncronos rodam em um ThreadPoolExecutor para não travar o loop. Uma
+    thread não pode ser cancelada: a busca síncrona que estoura o timeout
+    continua rodando até terminar e só então devolve a vaga do semáforo,
+    então o limite por zona vale também para elas
+"""
+import asyncio
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from time import sleep
+
+from .abstract_factory import (VeiculoFactory, VeiculoLuxo, VeiculoPopular,
+                               ZonaNorteVeiculoFactory, ZonaSulVeiculoFactory)
+
+FAMILIAS = ('get_carro_popular', 'get_carro_luxo', 'get_moto_popular',
+            'get_moto_luxo')
+
+
+class AsyncDispatcher:
+    def __init__(self, factories, limite_por_zona=4, timeout=1.0,
+                 executor=None) -> None:
+        self._factories = list(factories)
+        self._limite = limite_por_zona
+        self._timeout = timeout
+        self._executor = executor
+
+    def _inicia(self, veiculo):
+        buscar = veiculo.buscar_cliente
+        if inspect.iscoroutinefunction(buscar):
+            return asyncio.ensure_future(buscar())
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(self._executor, buscar)
+
+    @staticmethod
+    def _solta(semaforo, busca):
+        semaforo.release()
+        if not busca.cancelled():
+            busca.exception()  # erro de uma busca abandonada não vira aviso
+
+    async def _busca_limitada(self, semaforo, zona, familia, veiculo):
+        await semaforo.acquire()
+        busca = self._inicia(veiculo)
+        try:
+            # shield: o timeout não cancela o futuro da thread, que ainda
+            # não terminou; ele só fica pronto quando a thread acabar
+            await asyncio.wait_for(asyncio.shield(busca), self._timeout)
+        except asyncio.TimeoutError:
+            return zona, familia, 'timeout'
+        except Exception as erro:
+            return zona, familia, erro
+        finally:
+            if isinstance(busca, asyncio.Task):
+                busca.cancel()  # corrotina: cancela de verdade
+            # A vaga volta quando a busca termina, não quando desistimos
+            busca.add_done_callback(
+                lambda busca: self._solta(semaforo, busca)
+            )
+        return zona, familia, 'ok'
+
+    async def busca_clientes(self, familias=FAMILIAS):
+        tarefas = []
+        for factory in self._factories:
+            zona = factory.__class__.__name__
+            semaforo = asyncio.Semaphore(self._limite)
+            for familia in familias:
+                veiculo = getattr(factory, familia)()
+                tarefas.append(
+                    self._busca_limitada(semaforo, zona, familia, veiculo)
+                )
+        # Se busca_clientes for cancelada, o gather cancela todas as buscas
+        return await asyncio.gather(*tarefas)
+
+
+class Cliente:
+    def __init__(self, dispatcher=None) -> None:
+        self.dispatcher = dispatcher or AsyncDispatcher(
+            [ZonaNorteVeiculoFactory(), ZonaSulVeiculoFactory()]
+        )
+
+    async def busca_clientes(self):
+        return await self.dispatcher.busca_clientes()
+
+
+# ---------------------------------------------------------------------------
+# Simulação com latência artificial
+# ---------------------------------------------------------------------------
+LATENCIA = 0.02
+
+
+class CarroLuxoAsync(VeiculoLuxo):
+    async def buscar_cliente(self) -> None:
+        await asyncio.sleep(LATENCIA)
+
+
+class CarroPopularAsync(VeiculoPopular):
+    async def buscar_cliente(self) -> None:
+        await asyncio.sleep(LATENCIA)
+
+
+class MotoPopularSync(VeiculoPopular):
+    def buscar_cliente(self) -> None:
+        sleep(LATENCIA)
+
+
+class MotoLuxoLenta(VeiculoLuxo):
+    async def buscar_cliente(self) -> None:
+        await asyncio.sleep(LATENCIA * 100)  # sempre estoura o timeout
+
+
+class MotoSyncLenta(VeiculoPopular):
+    """Busca síncrona que estoura o timeout; conta as threads em voo."""
+    lock = Lock()
+    em_voo = 0
+    pico = 0
+
+    def buscar_cliente(self) -> None:
+        cls = MotoSyncLenta
+        with cls.lock:
+            cls.em_voo += 1
+            cls.pico = max(cls.pico, cls.em_voo)
+        sleep(LATENCIA * 10)
+        with cls.lock:
+            cls.em_voo -= 1
+
+
+class ZonaSimuladaVeiculoFactory(VeiculoFactory):
+    @staticmethod
+    def get_carro_luxo() -> VeiculoLuxo:  # type: ignore
+        return CarroLuxoAsync()
+
+    @staticmethod
+    def get_carro_popular() -> VeiculoPopular:  # type: ignore
+        return CarroPopularAsync()
+
+    @staticmethod
+    def get_moto_luxo() -> VeiculoLuxo:  # type: ignore
+        return MotoLuxoLenta()
+
+    @staticmethod
+    def get_moto_popular() -> VeiculoPopular:  # type: ignore
+        return MotoPopularSync()
+
+
+def _sequencial(factories):
+    """O laço original do Cliente, com as mesmas latências."""
+    for factory in factories:
+        for familia in FAMILIAS[:3]:
+            veiculo = getattr(factory, familia)()
+            if inspect.iscoroutinefunction(veiculo.buscar_cliente):
+                sleep(LATENCIA)
+            else:
+                veiculo.buscar_cliente()
+
+
+async def _simulacao():
+    from collections import Counter
+    from time import perf_counter
+
+    print(f'{"zonas":>6} {"sequencial":>11} {"concorrente":>12} '
+          f'{"resultados":>30}')
+    for n_zonas in (1, 2, 4, 8, 16, 32):
+        factories = [ZonaSimuladaVeiculoFactory() for _ in range(n_zonas)]
+        t0 = perf_counter()
+        _sequencial(factories)
+        sequencial = perf_counter() - t0
+
+        with ThreadPoolExecutor(max_workers=n_zonas) as executor:
+            dispatcher = AsyncDispatcher(factories, limite_por_zona=4,
+                                         timeout=LATENCIA * 5,
+                                         executor=executor)
+            t0 = perf_counter()
+            # As mesmas três famílias que o Cliente original visita
+            resultados = await dispatcher.busca_clientes(FAMILIAS[:3])
+            concorrente = perf_counter() - t0
+        contagem = Counter(status for _, _, status in resultados)
+        print(f'{n_zonas:>6} {sequencial * 1000:>9.0f}ms '
+              f'{concorrente * 1000:>10.0f}ms {dict(contagem)!s:>30}')
+
+    # Timeout: a moto de luxo lenta não segura o despacho inteiro
+    dispatcher = AsyncDispatcher([ZonaSimuladaVeiculoFactory()],
+                                 timeout=LATENCIA * 5)
+    t0 = perf_counter()
+    resultados = await dispatcher.busca_clientes()
+    print(f'timeout: {(perf_counter() - t0) * 1000:.0f}ms',
+          [(familia, status) for _, familia, status in resultados])
+
+    # Timeout síncrono: a thread segue rodando e segura a vaga da zona
+    class ZonaLentaSync(ZonaSimuladaVeiculoFactory):
+        get_carro_popular = get_moto_popular = staticmethod(MotoSyncLenta)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        dispatcher = AsyncDispatcher([ZonaLentaSync()], limite_por_zona=1,
+                                     timeout=LATENCIA * 2, executor=executor)
+        resultados = await dispatcher.busca_clientes(FAMILIAS[:3])
+    assert MotoSyncLenta.pico == 1, MotoSyncLenta.pico
+    print('timeout síncrono, threads em voo no pico:', MotoSyncLenta.pico,
+          [status for _, _, status in resultados])
+
+    # Cancelamento: interromper o despacho cancela as buscas pendentes
+    dispatcher = AsyncDispatcher([ZonaSimuladaVeiculoFactory()], timeout=10)
+    tarefa = asyncio.ensure_future(dispatcher.busca_clientes())
+    await asyncio.sleep(LATENCIA * 2)
+    tarefa.cancel()
+    try:
+        await tarefa
+    except asyncio.CancelledError:
+        print('despacho cancelado')
+
+
+if __name__ == "__main__":
+    asyncio.run(Cliente().busca_clientes())
+    asyncio.run(_simulacao())
@@ -0,0 +1,92 @@
+"""
+Abstract Factory com o cache de produtos de ../product_cache.py
+
+Os veículos sem estado desta pasta são registrados como flyweights.
+"""
+from ..product_cache import ProductCache
+from .abstract_factory import (CarroLuxoZN, CarroLuxoZS,
+                               CarroPopularZN, CarroPopularZS, MotoLuxoZN,
+                               MotoLuxoZS, MotoPopularZN, MotoPopularZS,
+                               VeiculoFactory, VeiculoLuxo, VeiculoPopular)
+
+
+# ---------------------------------------------------------------------------
+# Abstract Factory com cache
+# ---------------------------------------------------------------------------
+cache = ProductCache(flyweights=(
+    CarroLuxoZN, CarroPopularZN, MotoLuxoZN, MotoPopularZN,
+    CarroLuxoZS, CarroPopularZS, MotoLuxoZS, MotoPopularZS,
+))
+
+
+class CachedZonaNorteVeiculoFactory(VeiculoFactory):
+    @staticmethod
+    def get_carro_luxo() -> VeiculoLuxo:  # type: ignore
+        return cache.get(CarroLuxoZN)
+
+    @staticmethod
+    def get_carro_popular() -> VeiculoPopular:  # type: ignore
+        return cache.get(CarroPopularZN)
+
+    @staticmethod
+    def get_moto_luxo() -> VeiculoLuxo:  # type: ignore
+        return cache.get(MotoLuxoZN)
+
+    @staticmethod
+    def get_moto_popular() -> VeiculoPopular:  # type: ignore
+        return cache.get(MotoPopularZN)
+
+
+class CachedZonaSulVeiculoFactory(VeiculoFactory):
+    @staticmethod
+    def get_carro_luxo() -> VeiculoLuxo:  # type: ignore
+        return cache.get(CarroLuxoZS)
+
+    @staticmethod
+    def get_carro_popular() -> VeiculoPopular:  # type: ignore
+        return cache.get(CarroPopularZS)
+
+    @staticmethod
+    def get_moto_luxo() -> VeiculoLuxo:  # type: ignore
+        return cache.get(MotoLuxoZS)
+
+    @staticmethod
+    def get_moto_popular() -> VeiculoPopular:  # type: ignore
+        return cache.get(MotoPopularZS)
+
+
+def _benchmark(n=1_000_000, janela=10_000):
+    import gc
+    from collections import deque
+    from time import perf_counter
+
+    from .abstract_factory import ZonaNorteVeiculoFactory
+
+    for nome, factory in (('sem cache', ZonaNorteVeiculoFactory()),
+                          ('flyweight', CachedZonaNorteVeiculoFactory())):
+        metodos = (factory.get_carro_luxo, factory.get_carro_popular,
+                   factory.get_moto_luxo, factory.get_moto_popular)
+        em_andamento = deque(maxlen=janela)
+        coletas = sum(s['collections'] for s in gc.get_stats())
+        t0 = perf_counter()
+        for _ in range(n // len(metodos)):
+            for get in metodos:
+                em_andamento.append(get())
+        duracao = perf_counter() - t0
+        coletas = sum(s['collections'] for s in gc.get_stats()) - coletas
+        print(f'{nome:>10}: {n / duracao:>12,.0f} veículos/s, '
+              f'{coletas} coletas do GC')
+
+
+if __name__ == "__main__":
+    for factory in [CachedZonaNorteVeiculoFactory(),
+                    CachedZonaSulVeiculoFactory()]:
+        carro_luxo = factory.get_carro_luxo()
+        carro_luxo.buscar_cliente()
+        print('flyweight:', carro_luxo is factory.get_carro_luxo())
+
+    _benchmark()
+    metricas = cache.metrics()
+    for nome, por_classe in metricas.pop('por_classe').items():
+        print(nome, por_classe)
+    print(metricas)
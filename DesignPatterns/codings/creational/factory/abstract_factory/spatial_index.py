@@ -0,0 +1,358 @@
+"""
+Índice espacial para escolher a zona e os veículos mais próximos
+
+Hoje quem chama escolhe ZonaNorteVeiculoFactory ou ZonaSulVeiculoFactory na
+mão. Aqui o ponto de embarque decide:
+
+    . GradeZonas divide a cidade em uma grade uniforme; cada célula aponta
+    para a fábrica da sua zona, então achar a zona de (x, y) é uma conta e
+    um acesso a lista, O(1). Os limites são inclusivos: um ponto na borda
+    máxima cai na última célula
+
+    . FrotaIndex guarda a posição dos veículos disponíveis e responde os k
+    mais próximos de um ponto com KD-trees
+
+As posições mudam o tempo todo, e uma KD-tree balanceada não aceita
+inserções baratas. Por isso a frota é uma floresta de KD-trees estáticas
+(o método logarítmico de Bentley e Saxe):
+
+    . uma atualização vai para um buffer pequeno; quando ele enche, vira
+    uma árvore, e árvores do mesmo nível se fundem como um contador binário
+    (custo amortizado O(log² n) por atualização)
+
+    . a posição antiga não é apagada da árvore: cada entrada guarda a versão
+    do veículo e é ignorada se a versão mudou. Quando as entradas velhas
+    passam das vivas, tudo é reconstruído numa árvore só
+
+    . a consulta percorre todas as árvores com o mesmo heap dos k melhores,
+    então a poda de uma vale para as outras
+
+Tudo em Python puro (sem NumPy).
+"""
+from heapq import heappush, heapreplace
+from itertools import count
+from math import sqrt
+
+from .abstract_factory import ZonaNorteVeiculoFactory, ZonaSulVeiculoFactory
+
+FOLHA = 16
+BUFFER = 64
+
+
+class GradeZonas:
+    def __init__(self, x_min, y_min, x_max, y_max, colunas, linhas,
+                 padrao=None) -> None:
+        self.x_min, self.y_min = x_min, y_min
+        self.x_max, self.y_max = x_max, y_max
+        self.colunas, self.linhas = colunas, linhas
+        self._largura = (x_max - x_min) / colunas
+        self._altura = (y_max - y_min) / linhas
+        self._celulas = [padrao] * (colunas * linhas)
+
+    def _celula(self, x, y):
+        if not (self.x_min <= x <= self.x_max
+                and self.y_min <= y <= self.y_max):
+            raise LookupError(f'Ponto ({x}, {y}) fora da área atendida')
+        # A borda máxima (e arredondamentos perto dela) dá n: fica em n - 1
+        coluna = min(int((x - self.x_min) // self._largura), self.colunas - 1)
+        linha = min(int((y - self.y_min) // self._altura), self.linhas - 1)
+        return linha * self.colunas + coluna
+
+    def atribui(self, x_min, y_min, x_max, y_max, factory) -> None:
+        """Liga à `factory` as células cujo centro cai no retângulo."""
+        for linha in range(self.linhas):
+            cy = self.y_min + (linha + 0.5) * self._altura
+            if not y_min <= cy < y_max:
+                continue
+            for coluna in range(self.colunas):
+                cx = self.x_min + (coluna + 0.5) * self._largura
+                if x_min <= cx < x_max:
+                    self._celulas[linha * self.colunas + coluna] = factory
+
+    def factory_em(self, x, y):
+        factory = self._celulas[self._celula(x, y)]
+        if factory is None:
+            raise LookupError(f'Nenhuma zona atende ({x}, {y})')
+        return factory
+
+
+class _KDTree:
+    """KD-tree 2D estática, balanceada, com folhas de até FOLHA pontos."""
+    __slots__ = ('xs', 'ys', 'ids', 'versoes', 'cortes')
+
+    def __init__(self, entradas) -> None:
+        entradas = list(entradas)
+        # Nó n (raiz 1, filhos 2n e 2n + 1) -> valor do corte no eixo dele
+        self.cortes = {}
+        self._constroi(entradas, 0, len(entradas), 0, 1)
+        self.xs = [e[0] for e in entradas]
+        self.ys = [e[1] for e in entradas]
+        self.ids = [e[2] for e in entradas]
+        self.versoes = [e[3] for e in entradas]
+
+    def _constroi(self, entradas, lo, hi, eixo, no):
+        if hi - lo <= FOLHA:
+            return
+        entradas[lo:hi] = sorted(entradas[lo:hi], key=lambda e: e[eixo])
+        meio = (lo + hi) // 2
+        self.cortes[no] = entradas[meio][eixo]
+        self._constroi(entradas, lo, meio, 1 - eixo, 2 * no)
+        self._constroi(entradas, meio, hi, 1 - eixo, 2 * no + 1)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def entradas(self):
+        return zip(self.xs, self.ys, self.ids, self.versoes)
+
+    def busca(self, qx, qy, k, heap, versoes, disponiveis, seq):
+        xs, ys, ids, vers = self.xs, self.ys, self.ids, self.versoes
+        cortes = self.cortes
+
+        def visita(lo, hi, eixo, no):
+            if hi - lo <= FOLHA:
+                for i in range(lo, hi):
+                    vid = ids[i]
+                    if versoes.get(vid) != vers[i] or vid not in disponiveis:
+                        continue
+                    dx = xs[i] - qx
+                    dy = ys[i] - qy
+                    d = dx * dx + dy * dy
+                    if len(heap) < k:
+                        heappush(heap, (-d, next(seq), vid))
+                    elif d < -heap[0][0]:
+                        heapreplace(heap, (-d, next(seq), vid))
+                return
+            meio = (lo + hi) // 2
+            # [lo, meio) fica <= corte e [meio, hi) >= corte no eixo do nó
+            diff = (qx if eixo == 0 else qy) - cortes[no]
+            if diff >= 0:
+                visita(meio, hi, 1 - eixo, 2 * no + 1)
+                if len(heap) < k or diff * diff < -heap[0][0]:
+                    visita(lo, meio, 1 - eixo, 2 * no)
+            else:
+                visita(lo, meio, 1 - eixo, 2 * no)
+                if len(heap) < k or diff * diff < -heap[0][0]:
+                    visita(meio, hi, 1 - eixo, 2 * no + 1)
+
+        visita(0, len(ids), 0, 1)
+
+
+class FrotaIndex:
+    def __init__(self) -> None:
+        self._posicoes = {}    # veículo -> (x, y)
+        self._versoes = {}     # veículo -> versão da posição atual
+        self._disponiveis = set()
+        self._buffer = {}      # veículo -> (x, y, versão), ainda sem árvore
+        self._arvores = []     # nível i: None ou árvore de ~BUFFER * 2**i
+        self._entradas = 0     # entradas nas árvores, vivas ou velhas
+        self._relogio = 0
+        self.reconstrucoes = 0
+
+    def __len__(self):
+        return len(self._posicoes)
+
+    def atualiza(self, veiculo, x, y, disponivel=None) -> None:
+        """
+        Move (ou insere) o veículo. Com disponivel=None a disponibilidade
+        atual é mantida; um veículo novo entra disponível.
+        """
+        if disponivel is None:
+            disponivel = (veiculo in self._disponiveis
+                          or veiculo not in self._posicoes)
+        # Versões vêm de um relógio global: um veículo removido e
+        # recolocado não ressuscita as entradas antigas
+        self._relogio += 1
+        versao = self._versoes[veiculo] = self._relogio
+        self._posicoes[veiculo] = (x, y)
+        if disponivel:
+            self._disponiveis.add(veiculo)
+        else:
+            self._disponiveis.discard(veiculo)
+        self._buffer[veiculo] = (x, y, versao)
+        if len(self._buffer) >= BUFFER:
+            self._esvazia_buffer()
+
+    def disponivel(self, veiculo) -> bool:
+        return veiculo in self._disponiveis
+
+    def disponiveis(self) -> frozenset:
+        """Cópia do conjunto de veículos disponíveis."""
+        return frozenset(self._disponiveis)
+
+    def marca_disponivel(self, veiculo, disponivel=True) -> None:
+        if veiculo not in self._posicoes:
+            raise KeyError(veiculo)
+        if disponivel:
+            self._disponiveis.add(veiculo)
+        else:
+            self._disponiveis.discard(veiculo)
+
+    def remove(self, veiculo) -> None:
+        del self._posicoes[veiculo]
+        del self._versoes[veiculo]  # entradas antigas ficam sem versão
+        self._disponiveis.discard(veiculo)
+        self._buffer.pop(veiculo, None)
+
+    def _vivas(self, entradas):
+        versoes = self._versoes
+        return [e for e in entradas if versoes.get(e[2]) == e[3]]
+
+    def _esvazia_buffer(self):
+        carga = [(x, y, v, ver) for v, (x, y, ver) in self._buffer.items()]
+        self._buffer.clear()
+        arvores = self._arvores
+        nivel = 0
+        while nivel < len(arvores) and arvores[nivel] is not None:
+            carga.extend(arvores[nivel].entradas())
+            self._entradas -= len(arvores[nivel])
+            arvores[nivel] = None
+            nivel += 1
+        if nivel == len(arvores):
+            arvores.append(None)
+        carga = self._vivas(carga)
+        arvores[nivel] = _KDTree(carga)
+        self._entradas += len(carga)
+        if self._entradas > 2 * len(self._posicoes) + BUFFER:
+            self.reconstroi()
+
+    def reconstroi(self) -> None:
+        """Junta tudo (sem as entradas velhas) em uma única árvore."""
+        versoes = self._versoes
+        carga = [(x, y, v, versoes[v]) for v, (x, y) in
+                 self._posicoes.items()]
+        self._buffer.clear()
+        self._arvores = []
+        self._entradas = 0
+        self.reconstrucoes += 1
+        if carga:
+            nivel = max(0, (len(carga) // BUFFER).bit_length() - 1)
+            self._arvores = [None] * nivel + [_KDTree(carga)]
+            self._entradas = len(carga)
+
+    def k_mais_proximos(self, x, y, k=1):
+        """Lista de (distância, veículo) dos k disponíveis mais próximos."""
+        # Entradas (-d², seq, veículo): em empates o contador decide, então
+        # os veículos em si nunca são comparados (podem nem ser ordenáveis)
+        heap = []
+        seq = count()
+        versoes, disponiveis = self._versoes, self._disponiveis
+        for veiculo, (vx, vy, _) in self._buffer.items():
+            if veiculo not in disponiveis:
+                continue
+            dx = vx - x
+            dy = vy - y
+            d = dx * dx + dy * dy
+            if len(heap) < k:
+                heappush(heap, (-d, next(seq), veiculo))
+            elif d < -heap[0][0]:
+                heapreplace(heap, (-d, next(seq), veiculo))
+        for arvore in self._arvores:
+            if arvore is not None:
+                arvore.busca(x, y, k, heap, versoes, disponiveis, seq)
+        return [(sqrt(-d), v) for d, _, v in sorted(heap, reverse=True)]
+
+    def linear(self, x, y, k=1):
+        """Varredura de todos os veículos (referência para conferência)."""
+        from heapq import nsmallest
+        from operator import itemgetter
+        candidatos = (
+            ((vx - x) * (vx - x) + (vy - y) * (vy - y), v)
+            for v, (vx, vy) in self._posicoes.items()
+            if v in self._disponiveis
+        )
+        return [(sqrt(d), v)
+                for d, v in nsmallest(k, candidatos, key=itemgetter(0))]
+
+
+def cidade_padrao():
+    """Cidade de 10 x 10 km: norte (y >= 5) e sul (y < 5)."""
+    grade = GradeZonas(0, 0, 10_000, 10_000, colunas=100, linhas=100)
+    grade.atribui(0, 5_000, 10_000, 10_000, ZonaNorteVeiculoFactory())
+    grade.atribui(0, 0, 10_000, 5_000, ZonaSulVeiculoFactory())
+    return grade
+
+
+def _benchmark(n_veiculos=50_000, consultas=1_000, k=5, movimentos=20_000):
+    from random import Random
+    from time import perf_counter
+
+    rng = Random(42)
+    frota = FrotaIndex()
+    t0 = perf_counter()
+    for v in range(n_veiculos):
+        frota.atualiza(v, rng.uniform(0, 10_000), rng.uniform(0, 10_000),
+                       disponivel=rng.random() < 0.8)
+    print(f'carga inicial: {n_veiculos} veículos em '
+          f'{perf_counter() - t0:.2f}s')
+
+    t0 = perf_counter()
+    for _ in range(movimentos):
+        v = rng.randrange(n_veiculos)
+        x, y = frota._posicoes[v]
+        frota.atualiza(v, min(9_999, max(0, x + rng.uniform(-50, 50))),
+                       min(9_999, max(0, y + rng.uniform(-50, 50))),
+                       disponivel=rng.random() < 0.8)
+    duracao = perf_counter() - t0
+    print(f'{movimentos} movimentos: {duracao / movimentos * 1e6:.1f} µs '
+          f'cada ({frota.reconstrucoes} reconstruções)')
+
+    pontos = [(rng.uniform(0, 10_000), rng.uniform(0, 10_000))
+              for _ in range(consultas)]
+    for nome, busca in (('KD-trees', frota.k_mais_proximos),
+                        ('linear', frota.linear)):
+        amostra = pontos if nome == 'KD-trees' else pontos[:50]
+        t0 = perf_counter()
+        for x, y in amostra:
+            busca(x, y, k)
+        duracao = perf_counter() - t0
+        print(f'{nome:>9}: {duracao / len(amostra) * 1e6:>9.1f} µs por '
+              f'consulta (k={k})')
+
+    assert all(frota.k_mais_proximos(x, y, k) == frota.linear(x, y, k)
+               for x, y in pontos[:50])
+    print('resultados conferidos com a varredura linear')
+
+
+if __name__ == "__main__":
+    grade = cidade_padrao()
+    frota = FrotaIndex()
+    frota.atualiza('carro-1', 1_000, 8_000)
+    frota.atualiza('carro-2', 1_200, 7_900)
+    frota.atualiza('moto-1', 9_000, 1_000)
+    frota.atualiza('moto-2', 1_100, 8_100, disponivel=False)
+
+    for x, y in ((1_050, 8_050), (8_800, 1_200)):
+        factory = grade.factory_em(x, y)
+        print(type(factory).__name__, frota.k_mais_proximos(x, y, k=2))
+        factory.get_carro_popular().buscar_cliente()
+
+    frota.atualiza('moto-1', 1_060, 8_040)  # a moto atravessou a cidade
+    print(frota.k_mais_proximos(1_050, 8_050, k=2))
+    frota.remove('carro-1')
+    frota.marca_disponivel('moto-2')
+    print(frota.k_mais_proximos(1_050, 8_050, k=2))
+
+    # Bordas inclusivas: os cantos máximos ainda são atendidos
+    assert isinstance(grade.factory_em(10_000, 10_000),
+                      ZonaNorteVeiculoFactory)
+    assert isinstance(grade.factory_em(10_000, 0), ZonaSulVeiculoFactory)
+    for x, y in ((10_000.001, 5_000), (-1, 5_000), (5_000, 10_001)):
+        try:
+            grade.factory_em(x, y)
+        except LookupError:
+            pass
+        else:
+            raise AssertionError(f'({x}, {y}) deveria estar fora da área')
+    print('bordas da grade ok')
+
+    # Veículos que não se comparam, parados no mesmo depósito
+    deposito = FrotaIndex()
+    fabrica = ZonaSulVeiculoFactory()
+    for _ in range(BUFFER + 10):  # parte no buffer, parte em árvore
+        deposito.atualiza(fabrica.get_carro_luxo(), 500, 500)
+    deposito.atualiza('moto-3', 500, 500)
+    deposito.atualiza(7, 500, 500)
+    print('empates:', len(deposito.k_mais_proximos(500, 500, k=5)))
+
+    _benchmark()
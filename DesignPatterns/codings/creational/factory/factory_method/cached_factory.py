@@ -0,0 +1,100 @@
+"""
+Factory Method com o cache de produtos de ../product_cache.py
+
+Os veículos sem estado desta pasta são registrados como flyweights; o
+CarroCompartilhado, que tem reset(), sai de um pool.
+"""
+from ..product_cache import ProductCache
+from .factory_method import (CarroLuxo, CarroPopular, MotoLuxo,
+                             MotoPopular, Veiculo, VeiculoFactory)
+
+
+# ---------------------------------------------------------------------------
+# Factory Method com cache
+# ---------------------------------------------------------------------------
+cache = ProductCache(flyweights=(CarroLuxo, CarroPopular, MotoLuxo,
+                                 MotoPopular))
+
+
+class CarroCompartilhado(Veiculo):
+    """Produto com estado: guarda os passageiros da corrida atual."""
+
+    def __init__(self) -> None:
+        self.passageiros = []
+
+    def reset(self) -> None:
+        self.passageiros.clear()
+
+    def buscar_cliente(self) -> None:
+        print(f'Carro compartilhado buscando {len(self.passageiros)} '
+              f'passageiros...')
+
+
+class CachedVeiculoFactory(VeiculoFactory):
+    _tipos: dict = {}
+
+    @classmethod
+    def get_carro(cls, tipo: str) -> Veiculo:  # type: ignore
+        try:
+            produto = cls._tipos[tipo]
+        except KeyError:
+            raise LookupError(f'Veículo {tipo} não existe') from None
+        return cache.get(produto)
+
+    def release(self) -> None:
+        cache.release(self.carro)
+
+
+class CachedZonaNorteVeiculoFactory(CachedVeiculoFactory):
+    _tipos = {
+        'luxo': CarroLuxo, 'popular': CarroPopular, 'moto': MotoPopular,
+        'moto_luxo': MotoLuxo, 'compartilhado': CarroCompartilhado,
+    }
+
+
+class CachedZonaSulVeiculoFactory(CachedVeiculoFactory):
+    _tipos = {'luxo': CarroLuxo, 'popular': CarroPopular}
+
+
+def _benchmark(n=1_000_000, janela=10_000):
+    import gc
+    import random
+    from collections import deque
+    from time import perf_counter
+
+    from .factory_method import ZonaNorteVeiculoFactory
+
+    random.seed(0)
+    tipos = ['luxo', 'popular', 'moto', 'moto_luxo']
+    pedidos = [random.choice(tipos) for _ in range(n)]
+    casos = (('sem cache', ZonaNorteVeiculoFactory.get_carro),
+             ('flyweight', CachedZonaNorteVeiculoFactory.get_carro))
+    for nome, get_carro in casos:
+        em_andamento = deque(maxlen=janela)
+        coletas = sum(s['collections'] for s in gc.get_stats())
+        t0 = perf_counter()
+        for tipo in pedidos:
+            em_andamento.append(get_carro(tipo))
+        duracao = perf_counter() - t0
+        coletas = sum(s['collections'] for s in gc.get_stats()) - coletas
+        print(f'{nome:>10}: {n / duracao:>12,.0f} veículos/s, '
+              f'{coletas} coletas do GC')
+
+
+if __name__ == "__main__":
+    f1 = CachedZonaNorteVeiculoFactory('luxo')
+    f2 = CachedZonaSulVeiculoFactory('luxo')
+    print('flyweight:', f1.carro is f2.carro)
+
+    f3 = CachedZonaNorteVeiculoFactory('compartilhado')
+    f3.carro.passageiros.append('Ana')
+    f3.buscar_cliente()
+    f3.release()
+    f4 = CachedZonaNorteVeiculoFactory('compartilhado')
+    print('pool:', f3.carro is f4.carro, f4.carro.passageiros)
+
+    _benchmark()
+    metricas = cache.metrics()
+    for nome, por_classe in metricas.pop('por_classe').items():
+        print(nome, por_classe)
+    print(metricas)
@@ -69,8 +69,126 @@ class ZonaSulVeiculoFactory(VeiculoFactory):
         assert 0, 'Veículo não existe'
 
 
+# ---------------------------------------------------------------------------
+# Fábricas reutilizáveis (uma por zona, criadas uma vez)
+#
+# ZonaNorteVeiculoFactory(tipo) aloca a fábrica e o veículo a cada pedido, e
+# a validação é a cadeia de ifs. As fábricas abaixo são construídas uma vez
+# por zona: os tipos aceitos ficam num frozenset (validação O(1)), cada tipo
+# já tem o construtor resolvido e um veículo pronto para o despacho.
+#
+#     . get_carro(tipo) cria só o veículo, sem fábrica em volta
+#     . buscar_cliente(tipo) usa o veículo pronto da zona: zero alocações
+# ---------------------------------------------------------------------------
+CATALOGO = {
+    'luxo': CarroLuxo,
+    'popular': CarroPopular,
+    'moto': MotoPopular,
+    'moto_luxo': MotoLuxo,
+}
+
+
+class ZonaFactory:
+    __slots__ = ('_construtores', '_prontos')
+    TIPOS: frozenset = frozenset()
+
+    def __init__(self) -> None:
+        self._construtores = {tipo: CATALOGO[tipo] for tipo in self.TIPOS}
+        self._prontos = {tipo: cls() for tipo, cls in
+                         self._construtores.items()}
+
+    def _inexistente(self, tipo: str) -> LookupError:
+        return LookupError(
+            f'Veículo {tipo} não existe na {self.__class__.__name__}'
+        )
+
+    def get_carro(self, tipo: str) -> Veiculo:
+        if tipo not in self.TIPOS:
+            raise self._inexistente(tipo)
+        return self._construtores[tipo]()
+
+    def buscar_cliente(self, tipo: str) -> None:
+        if tipo not in self.TIPOS:
+            raise self._inexistente(tipo)
+        self._prontos[tipo].buscar_cliente()
+
+
+class ZonaNorteFactory(ZonaFactory):
+    __slots__ = ()
+    TIPOS = frozenset({'luxo', 'popular', 'moto', 'moto_luxo'})
+
+
+class ZonaSulFactory(ZonaFactory):
+    __slots__ = ()
+    TIPOS = frozenset({'luxo', 'popular'})
+
+
+def _benchmark(n=1_000_000, amostra=20_000):
+    import io
+    import tracemalloc
+    from contextlib import redirect_stdout
+    from random import Random
+    from time import perf_counter
+
+    pedidos = Random(0).choices(sorted(ZonaNorteFactory.TIPOS), k=n)
+    zona_norte = ZonaNorteFactory()
+
+    def antes(tipo):
+        carro = ZonaNorteVeiculoFactory(tipo)
+        carro.buscar_cliente()
+        return carro
+
+    def depois_get_carro(tipo):
+        carro = zona_norte.get_carro(tipo)
+        carro.buscar_cliente()
+        return carro
+
+    casos = {
+        'antes: Factory(tipo)': antes,
+        'depois: get_carro': depois_get_carro,
+        'depois: buscar_cliente': zona_norte.buscar_cliente,
+    }
+
+    class _Nulo(io.TextIOBase):
+        def write(self, texto):
+            return len(texto)
+
+    with redirect_stdout(_Nulo()):
+        resultados = []
+        for nome, caso in casos.items():
+            t0 = perf_counter()
+            for tipo in pedidos:
+                caso(tipo)
+            vazao = n / (perf_counter() - t0)
+
+            # Blocos que cada pedido deixa alocados enquanto o resultado vive
+            vivos = [None] * amostra
+            filtro = [tracemalloc.Filter(False, tracemalloc.__file__)]
+            tracemalloc.start()
+            antes_snapshot = tracemalloc.take_snapshot()
+            for i, tipo in enumerate(pedidos[:amostra]):
+                vivos[i] = caso(tipo)
+            depois_snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            diferenca = depois_snapshot.filter_traces(filtro).compare_to(
+                antes_snapshot.filter_traces(filtro), 'filename'
+            )
+            del vivos
+            resultados.append((
+                nome, vazao,
+                sum(d.count_diff for d in diferenca) / amostra,
+                sum(d.size_diff for d in diferenca) / amostra,
+            ))
+
+    for nome, vazao, blocos, tamanho in resultados:
+        print(f'{nome:>24}: {vazao:>12,.0f} pedidos/s, '
+              f'{blocos:.2f} blocos e {tamanho:.0f} bytes por pedido')
+
+
 if __name__ == "__main__":
+    import sys
     from random import choice
+
     veiculos_disponiveis_zn = ['luxo', 'popular', 'moto']
     veiculos_disponiveis_zs = ['luxo', 'popular']
 
@@ -85,3 +203,22 @@ if __name__ == "__main__":
     for i in range(10):
         carro2 = ZonaSulVeiculoFactory(choice(veiculos_disponiveis_zs))
         carro2.buscar_cliente()
+
+    print()
+
+    print("FÁBRICAS REUTILIZÁVEIS")
+    zona_norte = ZonaNorteFactory()
+    zona_sul = ZonaSulFactory()
+    for i in range(5):
+        zona_norte.buscar_cliente(choice(veiculos_disponiveis_zn))
+        zona_sul.buscar_cliente(choice(veiculos_disponiveis_zs))
+    try:
+        zona_sul.get_carro('moto')
+    except LookupError as erro:
+        print(erro)
+
+    # Ex.: `python -m creational.factory.factory_method.factory_method
+    # --benchmark` para medir 1M de pedidos
+    if '--benchmark' in sys.argv[1:]:
+        print()
+        _benchmark()
@@ -0,0 +1,244 @@
+"""
+Gerador de carga para as fábricas de veículos
+
+Os blocos __main__ das fábricas sorteiam dez veículos e imprimem. Para
+comparar implementações antes e depois de uma mudança, este script passa
+milhões de pedidos sintéticos pelas fábricas de simple_factory,
+factory_method e abstract_factory:
+
+    . os pedidos vêm de um random.Random com semente fixa, então toda
+    execução com a mesma semente gera a mesma sequência
+
+    . a distribuição dos tipos é configurável: 'uniforme', 'zipf' (poucos
+    tipos concentram a maioria dos pedidos) ou pesos explícitos
+    (--dist luxo=5,popular=3)
+
+    . com --buscar, buscar_cliente também é chamado e os prints vão para
+    um sink nulo, para medir a fábrica e não o terminal
+
+Para cada fábrica são medidos: pedidos por segundo (passada sem cronômetro),
+percentis de latência por pedido (passada com perf_counter_ns, já descontado
+o custo do próprio cronômetro) e, com tracemalloc em uma amostra menor,
+quantos blocos e bytes cada pedido deixa alocados enquanto o resultado
+está vivo.
+
+Os módulos são importados sob demanda pelo pacote (creational.factory), a
+partir de DesignPatterns/codings:
+
+    python -m creational.factory.load_generator -n 1000000 --dist zipf
+"""
+import argparse
+import sys
+import tracemalloc
+from array import array
+from contextlib import redirect_stdout
+from importlib import import_module
+from random import Random
+from time import perf_counter, perf_counter_ns
+
+
+def carrega(modulo):
+    """Importa `subpasta.modulo` relativo a este pacote."""
+    return import_module(f'.{modulo}', __package__)
+
+
+class NullSink:
+    """Saída que descarta tudo (substitui o stdout durante a carga)."""
+
+    def write(self, texto):
+        return len(texto)
+
+    def flush(self):
+        pass
+
+
+# ---------------------------------------------------------------------------
+# Casos: nome -> (tipos aceitos, função que monta o callable tipo -> objeto)
+# ---------------------------------------------------------------------------
+def _abstract(modulo, classe):
+    factory = getattr(carrega(modulo), classe)()
+    metodos = {
+        'luxo': factory.get_carro_luxo, 'popular': factory.get_carro_popular,
+        'moto': factory.get_moto_popular, 'moto_luxo': factory.get_moto_luxo,
+    }
+    return lambda tipo: metodos[tipo]()
+
+
+SIMPLES = ('luxo', 'popular', 'moto_taxi', 'moto_taxi_luxo', 'moto_entrega')
+ZN = ('luxo', 'popular', 'moto', 'moto_luxo')
+ZS = ('luxo', 'popular')
+
+CASOS = {
+    'simple_factory1': (SIMPLES, lambda: carrega(
+        'simple_factory.simple_factory1').VeiculoFactory.get_carro),
+    'simple_factory2': (ZN, lambda: carrega(
+        'simple_factory.simple_factory2').VeiculoFactory),
+    'registry_factory': (SIMPLES, lambda: carrega(
+        'simple_factory.registry_factory').VeiculoFactory.get_carro),
+    'simple_cache': (SIMPLES, lambda: carrega(
+        'simple_factory.cached_factory').CachedVeiculoFactory.get_carro),
+    'method_zn': (ZN, lambda: carrega(
+        'factory_method.factory_method').ZonaNorteVeiculoFactory),
+    'method_zs': (ZS, lambda: carrega(
+        'factory_method.factory_method').ZonaSulVeiculoFactory),
+    'method_reuse_zn': (ZN, lambda: carrega(
+        'factory_method.factory_method').ZonaNorteFactory().get_carro),
+    'method_reuse_zs': (ZS, lambda: carrega(
+        'factory_method.factory_method').ZonaSulFactory().get_carro),
+    'method_cache_zn': (ZN, lambda: carrega(
+        'factory_method.cached_factory').CachedZonaNorteVeiculoFactory),
+    'abstract_zn': (ZN, lambda: _abstract(
+        'abstract_factory.abstract_factory', 'ZonaNorteVeiculoFactory')),
+    'abstract_cache_zn': (ZN, lambda: _abstract(
+        'abstract_factory.cached_factory',
+        'CachedZonaNorteVeiculoFactory')),
+}
+
+
+def pesos_da_distribuicao(tipos, dist, s=1.2):
+    if dist == 'uniforme':
+        return [1.0] * len(tipos)
+    if dist == 'zipf':
+        return [1 / (posicao ** s) for posicao in range(1, len(tipos) + 1)]
+    pesos = {}
+    for par in dist.split(','):
+        tipo, igual, peso = (p.strip() for p in par.partition('='))
+        if not tipo or not igual:
+            raise ValueError(f'par {par!r} inválido; use tipo=peso')
+        try:
+            pesos[tipo] = float(peso)
+        except ValueError:
+            raise ValueError(f'peso {peso!r} de {tipo!r} não é um número') \
+                from None
+        if not pesos[tipo] >= 0:
+            raise ValueError(f'peso de {tipo!r} deve ser >= 0')
+    return [pesos.get(tipo, 0.0) for tipo in tipos]
+
+
+def gera_pedidos(tipos, n, dist='uniforme', seed=0):
+    pesos = pesos_da_distribuicao(tipos, dist)
+    if not any(pesos):
+        raise ValueError(f'Distribuição {dist!r} não cobre {tipos}')
+    return Random(seed).choices(tipos, weights=pesos, k=n)
+
+
+# ---------------------------------------------------------------------------
+# Medições
+# ---------------------------------------------------------------------------
+def _vazao(fabrica, pedidos, buscar):
+    t0 = perf_counter()
+    if buscar:
+        for tipo in pedidos:
+            fabrica(tipo).buscar_cliente()
+    else:
+        for tipo in pedidos:
+            fabrica(tipo)
+    return len(pedidos) / (perf_counter() - t0)
+
+
+def _custo_cronometro(n=100_000):
+    agora = perf_counter_ns
+    menor = None
+    for _ in range(n):
+        t0 = agora()
+        custo = agora() - t0
+        if menor is None or custo < menor:
+            menor = custo
+    return menor
+
+
+def _latencias(fabrica, pedidos, buscar, desconto):
+    agora = perf_counter_ns
+    tempos = array('q', bytes(8 * len(pedidos)))
+    for i, tipo in enumerate(pedidos):
+        t0 = agora()
+        obj = fabrica(tipo)
+        if buscar:
+            obj.buscar_cliente()
+        tempos[i] = agora() - t0 - desconto
+    return sorted(tempos)
+
+
+def percentil(ordenados, p):
+    indice = min(len(ordenados) - 1, int(p / 100 * len(ordenados)))
+    return ordenados[indice]
+
+
+def _alocacoes(fabrica, pedidos):
+    # Resultados ficam vivos numa lista pré-alocada: o que sobra no
+    # tracemalloc é o que cada pedido alocou (fábrica, veículo, ...)
+    vivos = [None] * len(pedidos)
+    tracemalloc.start()
+    antes = tracemalloc.take_snapshot()
+    for i, tipo in enumerate(pedidos):
+        vivos[i] = fabrica(tipo)
+    depois = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    filtro = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    diferenca = depois.filter_traces(filtro).compare_to(
+        antes.filter_traces(filtro), 'filename'
+    )
+    blocos = sum(d.count_diff for d in diferenca)
+    tamanho = sum(d.size_diff for d in diferenca)
+    del vivos
+    return blocos / len(pedidos), tamanho / len(pedidos)
+
+
+def executa(casos, n=1_000_000, dist='uniforme', seed=0, buscar=False,
+            amostra=20_000):
+    desconto = _custo_cronometro()
+    print(f'{n:,} pedidos, distribuição {dist}, semente {seed}, '
+          f'cronômetro {desconto} ns descontado')
+    print(f'{"fábrica":>18} {"pedidos/s":>12} {"p50":>6} {"p90":>6} '
+          f'{"p99":>6} {"p99.9":>7} {"máx":>8} {"blocos":>7} {"bytes":>7}')
+    resultados = {}
+    with redirect_stdout(NullSink()):
+        for nome in casos:
+            tipos, monta = CASOS[nome]
+            fabrica = monta()
+            pedidos = gera_pedidos(tipos, n, dist, seed)
+            fabrica(pedidos[0])  # aquece caches e flyweights
+            vazao = _vazao(fabrica, pedidos, buscar)
+            tempos = _latencias(fabrica, pedidos, buscar, desconto)
+            blocos, tamanho = _alocacoes(fabrica, pedidos[:amostra])
+            resultados[nome] = linha = {
+                'ops_s': vazao,
+                **{f'p{p}': percentil(tempos, p) for p in (50, 90, 99, 99.9)},
+                'max': tempos[-1], 'blocos_op': blocos, 'bytes_op': tamanho,
+            }
+            print(f'{nome:>18} {vazao:>12,.0f} {linha["p50"]:>6} '
+                  f'{linha["p90"]:>6} {linha["p99"]:>6} {linha["p99.9"]:>7} '
+                  f'{linha["max"]:>8} {blocos:>7.2f} {tamanho:>7.1f}',
+                  file=sys.__stdout__)
+    return resultados
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('-n', type=int, default=1_000_000,
+                        help='pedidos por fábrica')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--dist', default='uniforme',
+                        help="'uniforme', 'zipf' ou pesos: luxo=5,popular=1")
+    parser.add_argument('--casos', default=','.join(CASOS),
+                        help='fábricas separadas por vírgula')
+    parser.add_argument('--buscar', action='store_true',
+                        help='chama buscar_cliente (saída no sink nulo)')
+    parser.add_argument('--amostra', type=int, default=20_000,
+                        help='pedidos medidos com tracemalloc')
+    args = parser.parse_args(argv)
+    casos = [c.strip() for c in args.casos.split(',') if c.strip()]
+    desconhecidos = [c for c in casos if c not in CASOS]
+    if desconhecidos:
+        parser.error(f'fábricas desconhecidas: {desconhecidos}; '
+                     f'opções: {", ".join(CASOS)}')
+    for caso in casos:
+        try:
+            gera_pedidos(CASOS[caso][0], 0, args.dist)
+        except ValueError as erro:
+            parser.error(f'--dist {args.dist!r}: {erro}')
+    executa(casos, args.n, args.dist, args.seed, args.buscar, args.amostra)
+
+
+if __name__ == "__main__":
+    main()
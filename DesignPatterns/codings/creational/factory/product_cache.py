@@ -0,0 +1,208 @@
+"""
+Cache de produtos para as fábricas: flyweights e pools de objetos
+
+CarroLuxo, MotoPopular e companhia não guardam estado nenhum, mas cada
+get_carro aloca um objeto novo. Num laço que despacha milhões de veículos
+por hora, isso é alocação e coleta de lixo à toa. O ProductCache fica entre
+a fábrica e as classes dos produtos:
+
+    . classes registradas como flyweight (ProductCache(flyweights=...) ou
+    cache.flyweight(cls)) têm um único objeto, compartilhado por todos.
+    O registro é explícito: uma instância recém-criada sem atributos não
+    prova que ninguém vai guardar estado nela depois
+
+    . produtos com estado que sabem se limpar (têm um método reset()) vêm
+    de um pool limitado: acquire() reaproveita um objeto devolvido com
+    release(), e o pool guarda no máximo `tamanho_pool` objetos livres.
+    Devolver um objeto que não saiu do pool (ou devolver duas vezes)
+    levanta ValueError. Os empréstimos são guardados por referência fraca
+    (ou forte, para classes sem __weakref__), então um id reaproveitado por
+    outro objeto nunca é aceito
+
+    . o resto continua sendo criado a cada pedido
+
+metrics() expõe alocações, acertos e taxa de acerto por classe. Como no
+registro de protótipos, os contadores não usam lock e servem como métrica.
+
+É o módulo comum às três pastas; as fábricas com cache de cada padrão ficam
+no cached_factory.py de simple_factory/, factory_method/ e
+abstract_factory/.
+"""
+from weakref import ref
+
+
+class ObjectPool:
+    def __init__(self, fabrica, tamanho=64, reset=None) -> None:
+        self._fabrica = fabrica
+        self._tamanho = tamanho
+        self._reset = reset
+        self._livres = []
+        # id() -> referência para os objetos entregues e não devolvidos
+        self._em_uso = {}
+        self.alocacoes = 0
+        self.hits = 0
+        self.descartes = 0
+
+    def acquire(self):
+        try:
+            obj = self._livres.pop()
+        except IndexError:
+            self.alocacoes += 1
+            obj = self._fabrica()
+        else:
+            self.hits += 1
+        self._empresta(obj)
+        return obj
+
+    def _empresta(self, obj):
+        chave = id(obj)
+        em_uso = self._em_uso
+        try:
+            # Empréstimo nunca devolvido: o objeto morre e sai daqui sozinho
+            em_uso[chave] = ref(obj, lambda _: em_uso.pop(chave, None))
+        except TypeError:
+            # Sem __weakref__: referência forte, o id não pode ser reusado
+            em_uso[chave] = lambda: obj
+
+    def release(self, obj) -> None:
+        referencia = self._em_uso.get(id(obj))
+        if referencia is None or referencia() is not obj:
+            raise ValueError(f'{obj!r} não está emprestado por este pool')
+        del self._em_uso[id(obj)]
+        if self._reset is not None:
+            self._reset(obj)
+        if len(self._livres) < self._tamanho:
+            self._livres.append(obj)
+        else:
+            self.descartes += 1
+
+    def __len__(self):
+        return len(self._livres)
+
+
+class ProductCache:
+    def __init__(self, tamanho_pool=64, flyweights=()) -> None:
+        self._tamanho_pool = tamanho_pool
+        self._flyweights = {}
+        self._pools = {}
+        self._sem_cache = {}  # classe -> alocações
+        self.hits_flyweight = 0
+        for cls in flyweights:
+            self.flyweight(cls)
+
+    def flyweight(self, cls):
+        """Registra `cls` como flyweight; também serve de decorator."""
+        if cls in self._pools or cls in self._sem_cache:
+            raise ValueError(f'{cls.__name__} já é servida sem flyweight')
+        self._flyweights.setdefault(cls, None)
+        return cls
+
+    def get(self, cls):
+        obj = self._flyweights.get(cls)
+        if obj is not None:
+            self.hits_flyweight += 1
+            return obj
+        pool = self._pools.get(cls)
+        if pool is not None:
+            return pool.acquire()
+        return self._novo(cls)
+
+    def _novo(self, cls):
+        if cls in self._flyweights:
+            obj = self._flyweights[cls] = cls()
+            return obj
+        if cls in self._sem_cache:
+            self._sem_cache[cls] += 1
+            return cls()
+        if callable(getattr(cls, 'reset', None)):
+            pool = self._pools[cls] = ObjectPool(
+                cls, self._tamanho_pool, cls.reset
+            )
+            return pool.acquire()
+        self._sem_cache[cls] = 1
+        return cls()
+
+    def compartilhado(self, obj) -> bool:
+        return self._flyweights.get(obj.__class__) is obj
+
+    def release(self, obj) -> None:
+        """Devolve um produto; para flyweights não faz nada."""
+        pool = self._pools.get(obj.__class__)
+        if pool is not None:
+            pool.release(obj)
+
+    def metrics(self):
+        por_classe = {}
+        for cls, obj in self._flyweights.items():
+            if obj is not None:
+                por_classe[cls.__name__] = {'tipo': 'flyweight',
+                                            'alocacoes': 1}
+        for cls, pool in self._pools.items():
+            total = pool.alocacoes + pool.hits
+            por_classe[cls.__name__] = {
+                'tipo': 'pool', 'alocacoes': pool.alocacoes,
+                'hits': pool.hits, 'hit_rate': pool.hits / total,
+                'livres': len(pool), 'descartes': pool.descartes,
+            }
+        for cls, alocacoes in self._sem_cache.items():
+            por_classe[cls.__name__] = {'tipo': 'sem cache',
+                                        'alocacoes': alocacoes}
+
+        alocacoes = sum(m['alocacoes'] for m in por_classe.values())
+        hits = self.hits_flyweight + sum(
+            pool.hits for pool in self._pools.values()
+        )
+        total = alocacoes + hits
+        resultado = {
+            'alocacoes': alocacoes, 'hits': hits,
+            'hit_rate': hits / total if total else 0.0,
+            'por_classe': por_classe,
+        }
+        return resultado
+
+
+if __name__ == "__main__":
+    class Estatico:
+        pass
+
+    class ComEstado:
+        def __init__(self) -> None:
+            self.passageiros = []
+
+        def reset(self) -> None:
+            self.passageiros.clear()
+
+    class ConfiguradoDepois:
+        pass
+
+    cache = ProductCache(flyweights=(Estatico,))
+    print('flyweight:', cache.get(Estatico) is cache.get(Estatico))
+
+    # Sem registro, uma instância vazia não vira flyweight
+    x = cache.get(ConfiguradoDepois)
+    x.destino = 'centro'
+    print('não compartilha estado:',
+          not hasattr(cache.get(ConfiguradoDepois), 'destino'))
+
+    a = cache.get(ComEstado)
+    a.passageiros.append('Ana')
+    cache.release(a)
+    try:
+        cache.release(a)
+    except ValueError as erro:
+        print('devolução dupla:', erro)
+    b, c = cache.get(ComEstado), cache.get(ComEstado)
+    print('pool:', b is a, b is not c, b.passageiros)
+
+    # Empréstimo perdido: o id liberado não vale para um objeto de fora
+    perdido = id(cache.get(ComEstado))
+    estranhos = [ComEstado() for _ in range(100)]
+    try:
+        cache.release(next(o for o in estranhos if id(o) == perdido))
+    except StopIteration:
+        print('id do empréstimo perdido não foi reusado')
+    except ValueError:
+        print('objeto de fora com id reaproveitado: recusado')
+    cache.release(b)
+    cache.release(c)
+    print(cache.metrics())
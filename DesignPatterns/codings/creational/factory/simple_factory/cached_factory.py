@@ -0,0 +1,121 @@
+"""
+Simple Factory com o cache de produtos de ../product_cache.py
+
+Os veículos sem estado desta pasta são registrados como flyweights; o
+CarroCompartilhado, que tem reset(), sai de um pool.
+"""
+from ..product_cache import ProductCache
+from .registry_factory import Van, Veiculo, registrar, veiculos
+from .simple_factory1 import (CarroLuxo, CarroPopular, MotoEntrega, MotoTaxi,
+                              MotoTaxiLuxo)
+
+
+# ---------------------------------------------------------------------------
+# Simple Factory com cache
+# ---------------------------------------------------------------------------
+@registrar('compartilhado')
+class CarroCompartilhado(Veiculo):
+    """Produto com estado: guarda os passageiros da corrida atual."""
+
+    def __init__(self) -> None:
+        self.passageiros = []
+
+    def reset(self) -> None:
+        self.passageiros.clear()
+
+    def buscar_cliente(self) -> None:
+        print(f'Carro compartilhado buscando {len(self.passageiros)} '
+              f'passageiros...')
+
+
+class CachedVeiculoFactory:
+    cache = ProductCache(flyweights=(CarroLuxo, CarroPopular, MotoTaxi,
+                                     MotoTaxiLuxo, MotoEntrega, Van))
+    _flyweights = {}  # tipo pedido -> flyweight, sem passar pelo registro
+
+    @classmethod
+    def get_carro(cls, tipo: str) -> Veiculo:
+        carro = cls._flyweights.get(tipo)
+        if carro is not None:
+            cls.cache.hits_flyweight += 1
+            return carro
+        carro = cls.cache.get(veiculos.construtor(tipo))
+        # Como no registro, só a grafia canônica (minúscula) fica guardada
+        if cls.cache.compartilhado(carro) and tipo.islower():
+            cls._flyweights[tipo] = carro
+        return carro
+
+    @classmethod
+    def release(cls, carro: Veiculo) -> None:
+        cls.cache.release(carro)
+
+
+def _benchmark(n=1_000_000, janela=10_000):
+    import gc
+    import random
+    from collections import deque
+    from time import perf_counter
+
+    from .registry_factory import VeiculoFactory
+    from .simple_factory1 import VeiculoFactory as VeiculoFactoryMatch
+
+    random.seed(0)
+    tipos = ['luxo', 'popular', 'moto_taxi', 'moto_taxi_luxo', 'moto_entrega']
+    pedidos = [random.choice(tipos) for _ in range(n)]
+    casos = (('match', VeiculoFactoryMatch), ('registro', VeiculoFactory),
+             ('flyweight', CachedVeiculoFactory))
+    for nome, fabrica in casos:
+        # As corridas em andamento seguram os últimos `janela` veículos
+        em_andamento = deque(maxlen=janela)
+        coletas = sum(s['collections'] for s in gc.get_stats())
+        t0 = perf_counter()
+        for tipo in pedidos:
+            em_andamento.append(fabrica.get_carro(tipo))
+        duracao = perf_counter() - t0
+        coletas = sum(s['collections'] for s in gc.get_stats()) - coletas
+        print(f'{nome:>10}: {n / duracao:>12,.0f} veículos/s, '
+              f'{coletas} coletas do GC')
+
+    # Com estado: corridas que seguram até 8 carros ao mesmo tempo
+    def corridas(get_carro, release):
+        em_uso = []
+        coletas = sum(s['collections'] for s in gc.get_stats())
+        t0 = perf_counter()
+        for _ in range(n):
+            carro = get_carro('compartilhado')
+            carro.passageiros.append('cliente')
+            em_uso.append(carro)
+            if len(em_uso) == 8:
+                for carro in em_uso:
+                    release(carro)
+                em_uso.clear()
+        duracao = perf_counter() - t0
+        coletas = sum(s['collections'] for s in gc.get_stats()) - coletas
+        return n / duracao, coletas
+
+    casos = (('alocando', VeiculoFactory.get_carro, lambda carro: None),
+             ('pool', CachedVeiculoFactory.get_carro,
+              CachedVeiculoFactory.release))
+    for nome, get_carro, release in casos:
+        taxa, coletas = corridas(get_carro, release)
+        print(f'{nome:>10}: {taxa:>12,.0f} veículos/s, {coletas} coletas '
+              f'do GC (com estado)')
+
+
+if __name__ == "__main__":
+    a = CachedVeiculoFactory.get_carro('luxo')
+    b = CachedVeiculoFactory.get_carro('luxo')
+    print('flyweight:', a is b)
+
+    c = CachedVeiculoFactory.get_carro('compartilhado')
+    c.passageiros += ['Ana', 'Bia']
+    c.buscar_cliente()
+    CachedVeiculoFactory.release(c)
+    d = CachedVeiculoFactory.get_carro('compartilhado')
+    print('pool:', c is d, d.passageiros)
+
+    _benchmark()
+    metricas = CachedVeiculoFactory.cache.metrics()
+    for nome, por_classe in metricas.pop('por_classe').items():
+        print(nome, por_classe)
+    print(metricas)
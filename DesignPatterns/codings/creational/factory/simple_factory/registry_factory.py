@@ -0,0 +1,224 @@
+"""
+Simple Factory com registro (dispatch O(1))
+
+Nos exemplos simple_factory1.py, simple_factory2.py e factory_method.py o
+get_carro percorre uma cadeia de `if`/`match` comparando strings: cada tipo
+novo deixa a busca mais lenta e exige editar a fábrica. Aqui a fábrica é um
+dict nome -> construtor:
+
+    . os veículos se registram com o decorator `@registrar('nome', ...)`
+
+    . get_carro(tipo) é um acesso ao dict; só numa falta o nome é
+    normalizado (lower) e procurado nos plugins
+
+    . plugins são descobertos pelos entry points do grupo 'veiculos'
+    (importlib.metadata), mas cada módulo só é importado quando alguém pede
+    um tipo dele, então a inicialização não importa todos os veículos.
+    `tipo in veiculos` só olha os nomes, sem importar nada, e um plugin
+    cujo import falhou continua disponível para a próxima tentativa
+
+Tipos desconhecidos levantam VeiculoInexistente (um LookupError) em vez do
+`assert 0`, que some com `python -O`.
+"""
+from importlib.metadata import entry_points
+
+from .simple_factory1 import (CarroLuxo, CarroPopular, MotoEntrega, MotoTaxi,
+                              MotoTaxiLuxo, Veiculo)
+
+
+class VeiculoInexistente(LookupError):
+    pass
+
+
+class VeiculoRegistry:
+    def __init__(self, grupo='veiculos') -> None:
+        self._construtores = {}
+        self._grupo = grupo
+        self._plugins = None  # nome -> EntryPoint, lido na primeira falta
+
+    def registrar(self, *nomes):
+        def decorator(construtor):
+            for nome in nomes or (construtor.__name__,):
+                self._construtores[nome.lower()] = construtor
+            return construtor
+        return decorator
+
+    def tipos(self):
+        self._descobre_plugins()
+        return sorted({*self._construtores, *self._plugins})
+
+    def __contains__(self, tipo):
+        nome = tipo.lower()
+        if nome in self._construtores:
+            return True
+        self._descobre_plugins()
+        return nome in self._plugins
+
+    def _descobre_plugins(self):
+        if self._plugins is None:
+            self._plugins = {
+                ep.name.lower(): ep for ep in entry_points(group=self._grupo)
+            }
+
+    def _resolve(self, tipo):
+        nome = tipo.lower()
+        construtor = self._construtores.get(nome)
+        if construtor is None:
+            self._descobre_plugins()
+            plugin = self._plugins.get(nome)
+            if plugin is not None:
+                # Se o load() falhar, o entry point fica para a próxima vez
+                carregado = plugin.load()
+                # O módulo pode ter se registrado sozinho ao ser importado
+                construtor = self._construtores.setdefault(nome, carregado)
+                del self._plugins[nome]
+        if construtor is None:
+            raise VeiculoInexistente(f'O veículo {tipo} não existe!')
+        # Só nomes em minúsculas entram no dict: grafias vindas de fora
+        # ('Van', 'LUXO') pagam um lower() por chamada, mas não acumulam
+        return construtor
+
+    def construtor(self, tipo: str):
+        construtor = self._construtores.get(tipo)
+        if construtor is None:
+            construtor = self._resolve(tipo)
+        return construtor
+
+    def get_carro(self, tipo: str) -> Veiculo:
+        construtor = self._construtores.get(tipo)
+        if construtor is None:
+            construtor = self._resolve(tipo)
+        return construtor()
+
+
+veiculos = VeiculoRegistry()
+registrar = veiculos.registrar
+
+registrar('luxo')(CarroLuxo)
+registrar('popular')(CarroPopular)
+registrar('moto_taxi')(MotoTaxi)
+registrar('moto_taxi_luxo')(MotoTaxiLuxo)
+registrar('moto_entrega')(MotoEntrega)
+
+
+@registrar('van', 'van_escolar')
+class Van(Veiculo):
+    def buscar_cliente(self) -> None:
+        print("Van buscando cliente...")
+
+
+class VeiculoFactory:
+    @staticmethod
+    def get_carro(tipo: str) -> Veiculo:
+        return veiculos.get_carro(tipo)
+
+
+def _demo_plugin():
+    """Cria um pacote falso com entry point e mostra o import preguiçoso."""
+    import importlib
+    import sys
+    import tempfile
+    from pathlib import Path
+
+    with tempfile.TemporaryDirectory() as temporario:
+        pasta = Path(temporario)
+        (pasta / 'veiculo_helicoptero.py').write_text(
+            f'from {__package__}.simple_factory1 import Veiculo\n\n\n'
+            'class Helicoptero(Veiculo):\n'
+            '    def buscar_cliente(self) -> None:\n'
+            '        print("Helicóptero buscando cliente...")\n'
+        )
+        info = pasta / 'veiculo_helicoptero-1.0.dist-info'
+        info.mkdir()
+        (info / 'METADATA').write_text(
+            'Metadata-Version: 2.1\nName: veiculo-helicoptero\nVersion: 1.0\n'
+        )
+        (info / 'entry_points.txt').write_text(
+            '[veiculos]\nhelicoptero = veiculo_helicoptero:Helicoptero\n'
+            'balao = veiculo_balao:Balao\n'
+        )
+        sys.path.insert(0, str(pasta))
+
+        registro = VeiculoRegistry()
+        print('tipos:', registro.tipos())
+        assert 'helicoptero' in registro and 'disco_voador' not in registro
+        print('importado antes:', 'veiculo_helicoptero' in sys.modules)
+        registro.get_carro('Helicoptero').buscar_cliente()
+        print('importado depois:', 'veiculo_helicoptero' in sys.modules)
+
+        # O módulo do balão ainda não existe: o import falha, mas o plugin
+        # continua registrado e funciona quando o módulo aparece
+        try:
+            registro.get_carro('balao')
+        except ImportError as erro:
+            print('primeira tentativa:', erro)
+        assert 'balao' in registro
+        (pasta / 'veiculo_balao.py').write_text(
+            f'from {__package__}.simple_factory1 import Veiculo\n\n\n'
+            'class Balao(Veiculo):\n'
+            '    def buscar_cliente(self) -> None:\n'
+            '        print("Balão buscando cliente...")\n'
+        )
+        importlib.invalidate_caches()
+        registro.get_carro('balao').buscar_cliente()
+        sys.path.remove(str(pasta))
+
+
+def _benchmark(n_tipos=500, n=200_000):
+    import random
+    from time import perf_counter
+
+    classes = [
+        type(f'Veiculo{i}', (Veiculo,), {'buscar_cliente': lambda self: None})
+        for i in range(n_tipos)
+    ]
+    nomes = [f'tipo_{i}' for i in range(n_tipos)]
+
+    # Cadeia de ifs equivalente às fábricas originais
+    ambiente = {f'C{i}': c for i, c in enumerate(classes)}
+    linhas = ['def get_carro(tipo):']
+    linhas += [f'    if tipo == {nome!r}:\n        return C{i}()'
+               for i, nome in enumerate(nomes)]
+    linhas.append("    raise LookupError(tipo)")
+    exec('\n'.join(linhas), ambiente)
+    cadeia = ambiente['get_carro']
+
+    registro = VeiculoRegistry()
+    for nome, cls in zip(nomes, classes):
+        registro.registrar(nome)(cls)
+
+    random.seed(0)
+    pedidos = [random.choice(nomes) for _ in range(n)]
+    for rotulo, get_carro in (('cadeia de ifs', cadeia),
+                              ('registro', registro.get_carro)):
+        t0 = perf_counter()
+        for tipo in pedidos:
+            get_carro(tipo)
+        media = (perf_counter() - t0) / n * 1e9
+        t0 = perf_counter()
+        for _ in range(n):
+            get_carro(nomes[-1])
+        pior = (perf_counter() - t0) / n * 1e9
+        print(f'{rotulo:>14}: {media:>6.0f} ns em média, '
+              f'{pior:>6.0f} ns no último tipo ({n_tipos} tipos)')
+
+
+if __name__ == "__main__":
+    import random
+
+    carros_disponiveis = [
+        "luxo", "popular", "moto_taxi", "moto_taxi_luxo", "moto_entrega",
+        "Van",
+    ]
+    for i in range(10):
+        carro = VeiculoFactory().get_carro(random.choice(carros_disponiveis))
+        carro.buscar_cliente()
+
+    try:
+        VeiculoFactory.get_carro('disco_voador')
+    except VeiculoInexistente as erro:
+        print(erro)
+    print('tipos:', veiculos.tipos())  # só nomes canônicos, sem 'Van'
+
+    _demo_plugin()
+    _benchmark()
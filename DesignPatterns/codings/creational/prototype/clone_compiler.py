@@ -0,0 +1,327 @@
+"""
+Compilador de clones para o Prototype
+
+copy.deepcopy é genérico: para cada objeto ele consulta o memo, procura
+__deepcopy__/__reduce_ex__ e reconstrói o objeto por reflexão. Aqui
+`compila_clone(Classe)` instala na classe:
+
+    . __deepcopy__, clone() e clone_many(n)
+
+    . um clonador gerado por (classe, layout de atributos): os atributos
+    são desenrolados em código e valores imutáveis (str, int, None, ...)
+    são reaproveitados sem nenhuma chamada
+
+Atributos em __slots__ de qualquer classe do MRO também são copiados (pelos
+descritores dos slots), como o deepcopy faz. O clone nasce de
+object.__new__, então compila_clone recusa (TypeError) classes sem __dict__
+e subclasses de tipos embutidos (list, dict, Exception, ...), cujo conteúdo
+não fica nos atributos.
+
+Listas, dicts, tuplas e sets são copiados por funções dedicadas; objetos de
+outras classes compiladas usam o clonador delas e o resto cai no deepcopy
+(com o mesmo memo). O memo por id continua existindo, então referências
+compartilhadas e ciclos são preservados como no deepcopy.
+"""
+
+from copy import deepcopy
+from types import FunctionType, MemberDescriptorType
+
+from .prototype import Address, Person
+
+_ATOMICOS = frozenset({
+    type(None), bool, int, float, complex, str, bytes, range, type,
+    FunctionType, type(Ellipsis), type(NotImplemented),
+})
+_NADA = object()
+# Bit de Py_TPFLAGS_HEAPTYPE: ligado nas classes definidas em Python
+_HEAPTYPE = 1 << 9
+
+# Cache de clonadores gerados, por (classe, layout dos atributos)
+_clonadores = {}
+# Classe (ou tipo embutido) -> função (obj, memo) -> cópia
+_copiadores = {}
+
+
+def _copia(valor, memo):
+    cls = valor.__class__
+    if cls in _ATOMICOS:
+        return valor
+    copia = memo.get(id(valor), _NADA)
+    if copia is not _NADA:
+        return copia
+    copiador = _copiadores.get(cls)
+    if copiador is None:
+        return deepcopy(valor, memo)
+    return copiador(valor, memo)
+
+
+def _copia_lista(lista, memo):
+    nova = []
+    memo[id(lista)] = nova
+    nova.extend([
+        v if v.__class__ in _ATOMICOS else _copia(v, memo) for v in lista
+    ])
+    return nova
+
+
+def _copia_dict(dicionario, memo):
+    novo = {}
+    memo[id(dicionario)] = novo
+    for k, v in dicionario.items():
+        novo[k if k.__class__ in _ATOMICOS else _copia(k, memo)] = \
+            v if v.__class__ in _ATOMICOS else _copia(v, memo)
+    return novo
+
+
+def _copia_set(conjunto, memo):
+    novo = conjunto.__class__(_copia(v, memo) for v in conjunto)
+    memo[id(conjunto)] = novo
+    return novo
+
+
+def _copia_tupla(tupla, memo):
+    nova = tuple([_copia(v, memo) for v in tupla])
+    # Tupla que já entrou no memo por um ciclo interno vence
+    copia = memo.get(id(tupla), _NADA)
+    if copia is not _NADA:
+        return copia
+    # Como o deepcopy: se nada mudou, a própria tupla é reaproveitada
+    if all(a is b for a, b in zip(nova, tupla)):
+        nova = tupla
+    memo[id(tupla)] = nova
+    return nova
+
+
+_copiadores.update({
+    list: _copia_lista, dict: _copia_dict, set: _copia_set,
+    frozenset: _copia_set, tuple: _copia_tupla,
+})
+
+
+def _descritores_de_slots(cls):
+    """Descritores de todos os slots do MRO (já com os nomes mutilados)."""
+    return [
+        descritor
+        for base in cls.__mro__ if '__slots__' in base.__dict__
+        for descritor in base.__dict__.values()
+        if isinstance(descritor, MemberDescriptorType)
+    ]
+
+
+def _gera_clonador(cls, layout):
+    """Compila um clonador específico para a classe e o layout dado."""
+    ambiente = {
+        'C': cls, 'L': layout, '_novo': object.__new__, '_AT': _ATOMICOS,
+        '_c': _copia, '_despacha': _copia_objeto,
+    }
+    linhas = [
+        'def _clona(obj, memo):',
+        '    d = obj.__dict__',
+        '    if obj.__class__ is not C or tuple(d) != L:',
+        '        return _despacha(obj, memo)',
+        '    novo = _novo(C)',
+        '    memo[id(obj)] = novo',
+    ]
+    itens = []
+    for i, k in enumerate(layout):
+        ambiente[f'k{i}'] = k
+        linhas.append(f'    v{i} = d[k{i}]')
+        itens.append(
+            f'k{i}: v{i} if v{i}.__class__ in _AT else _c(v{i}, memo)'
+        )
+    linhas.append(f"    novo.__dict__ = {{{', '.join(itens)}}}")
+    # Slot vazio levanta AttributeError e continua vazio na cópia
+    for i, descritor in enumerate(_descritores_de_slots(cls)):
+        ambiente[f'g{i}'] = descritor.__get__
+        ambiente[f's{i}'] = descritor.__set__
+        linhas += [
+            '    try:',
+            f'        w{i} = g{i}(obj)',
+            '    except AttributeError:',
+            '        pass',
+            '    else:',
+            f'        s{i}(novo, w{i} if w{i}.__class__ in _AT '
+            f'else _c(w{i}, memo))',
+        ]
+    linhas.append('    return novo')
+    exec('\n'.join(linhas), ambiente)
+    return ambiente['_clona']
+
+
+def _copia_objeto(obj, memo):
+    cls = obj.__class__
+    chave = (cls, tuple(obj.__dict__))
+    clonador = _clonadores.get(chave)
+    if clonador is None:
+        clonador = _clonadores[chave] = _gera_clonador(*chave)
+    if cls in _copiadores:
+        # O último layout visto vira o caminho direto (o clonador confere
+        # o layout e volta para cá se não bater)
+        _copiadores[cls] = clonador
+    return clonador(obj, memo)
+
+
+def compila_clone(cls):
+    """Instala __deepcopy__, clone e clone_many compilados em `cls`."""
+    if not cls.__dictoffset__:
+        raise TypeError('compila_clone suporta apenas instâncias com __dict__')
+    embutidos = [base.__name__ for base in cls.__mro__[:-1]
+                 if not base.__flags__ & _HEAPTYPE]
+    if embutidos:
+        raise TypeError(f'compila_clone não reconstrói {cls.__name__}: '
+                        f'herda de {", ".join(embutidos)}')
+
+    def __deepcopy__(self, memo):
+        return _copia_objeto(self, memo)
+
+    def clone(self):
+        return _copia_objeto(self, {})
+
+    def clone_many(self, n):
+        chave = (self.__class__, tuple(self.__dict__))
+        clonador = _clonadores.get(chave)
+        if clonador is None:
+            clonador = _clonadores[chave] = _gera_clonador(*chave)
+        return [clonador(self, {}) for _ in range(n)]
+
+    _copiadores[cls] = _copia_objeto
+    cls.__deepcopy__ = __deepcopy__
+    cls.clone = clone
+    cls.clone_many = clone_many
+    return cls
+
+
+@compila_clone
+class FastPerson(Person):
+    pass
+
+
+@compila_clone
+class FastAddress(Address):
+    pass
+
+
+def _verifica():
+    """Conferências de correção: referências compartilhadas e ciclos."""
+    @compila_clone
+    class No:
+        def __init__(self, valor):
+            self.valor = valor
+            self.filhos = []
+            self.pai = None
+
+    # Referência compartilhada: dois atributos apontam para o mesmo Address
+    endereco = Address('Rua X', '1')
+    pessoa = FastPerson('Ana', 'Silva')
+    pessoa.add_address(endereco)
+    pessoa.principal = endereco
+    copia = pessoa.clone()
+    assert copia.principal is copia.addresses[0]
+    assert copia.principal is not endereco
+    assert copia.principal.street == 'Rua X'
+
+    # Ciclos: pai <-> filho e uma lista que contém a si mesma
+    raiz = No(1)
+    filho = No(2)
+    filho.pai = raiz
+    raiz.filhos.append(filho)
+    raiz.filhos.append(raiz.filhos)
+    clone = raiz.clone()
+    assert clone.filhos[0].pai is clone
+    assert clone.filhos[1] is clone.filhos
+    assert clone.filhos is not raiz.filhos
+
+    # Tuplas, dicts e sets aninhados; tupla imutável é reaproveitada
+    raiz.extra = {'t': (1, 'a'), 's': {1, 2}, 'l': ([raiz],)}
+    clone = deepcopy(raiz)  # usa o __deepcopy__ compilado
+    assert clone.extra['t'] is raiz.extra['t']
+    assert clone.extra['s'] == {1, 2} and clone.extra['s'] is not \
+        raiz.extra['s']
+    assert clone.extra['l'][0][0] is clone
+
+    # Layouts diferentes na mesma classe e clone_many
+    outra = FastPerson('Bia', 'Souza')
+    assert not hasattr(outra.clone(), 'principal')
+    clones = pessoa.clone_many(3)
+    assert len({id(c.addresses) for c in clones}) == 3
+
+    # Slots herdados (inclusive um privado e um vazio) e slots de subclasse
+    class Placa:
+        __slots__ = ('placa', '__chassi', 'vazio')
+
+        def __init__(self, placa):
+            self.placa = placa
+            self.__chassi = [placa]
+
+    @compila_clone
+    class Carro(Placa):
+        pass
+
+    class CarroBlindado(Carro):
+        __slots__ = ('nivel',)
+
+    carro = CarroBlindado('ABC1234')
+    carro.nivel = ['III']
+    carro.cor = 'preto'
+    for copia in (carro.clone(), carro.clone_many(1)[0], deepcopy(carro)):
+        assert copia.placa == 'ABC1234' and copia.cor == 'preto'
+        assert copia.nivel == ['III'] and copia.nivel is not carro.nivel
+        assert copia._Placa__chassi == ['ABC1234']
+        assert copia._Placa__chassi is not carro._Placa__chassi
+        assert not hasattr(copia, 'vazio')
+
+    # Tipos que object.__new__ + atributos não reconstroem são recusados
+    class Rota(list):
+        pass
+
+    class Tabela(dict):
+        pass
+
+    class SoSlots:
+        __slots__ = ('x',)
+
+    for cls in (Rota, Tabela, SoSlots):
+        try:
+            compila_clone(cls)
+        except TypeError:
+            pass
+        else:
+            raise AssertionError(f'{cls.__name__} deveria ser recusada')
+    print('verificações ok')
+
+
+def _benchmark(enderecos=100, n=2_000):
+    import pickle
+    from time import perf_counter
+
+    pessoa = Person('João', 'Justino')
+    rapida = FastPerson('João', 'Justino')
+    for i in range(enderecos):
+        pessoa.add_address(Address(f'Rua {i}', str(i)))
+        rapida.add_address(FastAddress(f'Rua {i}', str(i)))
+
+    casos = {
+        'deepcopy': lambda: [deepcopy(pessoa) for _ in range(n)],
+        'pickle': lambda: [pickle.loads(pickle.dumps(pessoa, -1))
+                           for _ in range(n)],
+        'compilado': lambda: rapida.clone_many(n),
+    }
+    for nome, caso in casos.items():
+        t0 = perf_counter()
+        caso()
+        print(f'{nome:>10}: {n} clones com {enderecos} endereços em '
+              f'{perf_counter() - t0:.3f}s')
+
+
+if __name__ == "__main__":
+    joao = FastPerson('João', 'Justino')
+    joao.add_address(FastAddress('Rua X', '1444'))
+
+    esposa_joao = joao.clone()
+    esposa_joao.firstname = 'Ninguém'
+    esposa_joao.addresses[0].number = '1500'
+    print(joao)
+    print(esposa_joao)
+
+    _verifica()
+    _benchmark()
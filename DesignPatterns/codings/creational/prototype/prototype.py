@@ -13,16 +13,7 @@ from __future__ import annotations
 from copy import deepcopy
 from typing import List
 
-
-class StringReprMixin:
-    def __str__(self):
-        params = ', '.join(
-            [f'{k}={v}' for k, v in self.__dict__.items()]
-        )
-        return f'{self.__class__.__name__}({params})'
-
-    def __repr__(self):
-        return self.__str__()
+from ..repr_mixin import StringReprMixin
 
 
 class Person(StringReprMixin):
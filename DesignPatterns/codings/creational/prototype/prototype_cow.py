@@ -0,0 +1,151 @@
+"""
+Prototype com cópia na escrita (copy-on-write)
+
+Person.clone() usa deepcopy e copia todos os Address, mesmo que o clone
+nunca altere nenhum deles. Aqui o CowPerson.clone() é O(1): o clone e o
+original passam a compartilhar a lista de endereços e cada Address, e a
+cópia só acontece na primeira escrita:
+
+    . adicionar um endereço copia a lista (rasa), não os Address
+
+    . alterar um atributo de um endereço copia só aquele Address
+
+Para interceptar as escritas, `person.addresses` devolve uma visão da lista
+cujos itens são proxies: leituras são repassadas ao Address e escritas
+disparam a cópia, se ele ainda estiver compartilhado.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from copy import copy
+
+from .prototype import Address, Person
+
+
+class _EnderecoCow:
+    __slots__ = ('_dono', '_indice')
+
+    def __init__(self, dono: CowPerson, indice: int) -> None:
+        object.__setattr__(self, '_dono', dono)
+        object.__setattr__(self, '_indice', indice)
+
+    def __getattr__(self, nome):
+        return getattr(self._dono._enderecos[self._indice], nome)
+
+    def __setattr__(self, nome, valor) -> None:
+        setattr(self._dono._endereco_mutavel(self._indice), nome, valor)
+
+    def __repr__(self) -> str:
+        return repr(self._dono._enderecos[self._indice])
+
+
+class _EnderecosCow(Sequence):
+    __slots__ = ('_dono',)
+
+    def __init__(self, dono: CowPerson) -> None:
+        self._dono = dono
+
+    def __len__(self) -> int:
+        return len(self._dono._enderecos)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError('índice fora do intervalo')
+        return _EnderecoCow(self._dono, i)
+
+    def append(self, address: Address) -> None:
+        self._dono.add_address(address)
+
+    def __repr__(self) -> str:
+        return repr(self._dono._enderecos)
+
+
+class CowPerson(Person):
+    def __init__(self, firstname: str, lastname: str) -> None:
+        self.firstname = firstname
+        self.lastname = lastname
+        self._enderecos: list[Address] = []
+        self._lista_propria = True
+        self._proprios: set[int] = set()
+
+    @property
+    def addresses(self) -> _EnderecosCow:  # type: ignore[override]
+        return _EnderecosCow(self)
+
+    def _lista_mutavel(self) -> list[Address]:
+        if not self._lista_propria:
+            self._enderecos = self._enderecos.copy()
+            self._lista_propria = True
+        return self._enderecos
+
+    def _endereco_mutavel(self, indice: int) -> Address:
+        enderecos = self._lista_mutavel()
+        if indice not in self._proprios:
+            enderecos[indice] = copy(enderecos[indice])
+            self._proprios.add(indice)
+        return enderecos[indice]
+
+    def add_address(self, address: Address) -> None:
+        enderecos = self._lista_mutavel()
+        enderecos.append(address)
+        self._proprios.add(len(enderecos) - 1)
+
+    def clone(self) -> CowPerson:
+        cls = type(self)
+        novo = cls.__new__(cls)
+        novo.__dict__.update(self.__dict__)
+        # A partir daqui os dois compartilham lista e endereços
+        novo._lista_propria = self._lista_propria = False
+        novo._proprios = set()
+        self._proprios = set()
+        return novo
+
+    def __str__(self) -> str:
+        return (f'{self.__class__.__name__}(firstname={self.firstname}, '
+                f'lastname={self.lastname}, addresses={self._enderecos})')
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+
+def _benchmark(enderecos=300, clones=200):
+    import tracemalloc
+    from time import perf_counter
+
+    original = Person('João', 'Justino')
+    original_cow = CowPerson('João', 'Justino')
+    for i in range(enderecos):
+        original.add_address(Address(f'Rua {i}', str(i)))
+        original_cow.add_address(Address(f'Rua {i}', str(i)))
+
+    for nome, prototipo in (('deepcopy', original), ('cow', original_cow)):
+        tracemalloc.start()
+        t0 = perf_counter()
+        copias = [prototipo.clone() for _ in range(clones)]
+        dt = perf_counter() - t0
+        memoria = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del copias
+        print(f'{nome:>8}: {clones} clones com {enderecos} endereços em '
+              f'{dt:.3f}s, {memoria / 2**20:.1f} MB')
+
+
+if __name__ == "__main__":
+    joao = CowPerson('João', 'Justino')
+    joao.add_address(Address('Rua X', '1444'))
+
+    esposa_joao = joao.clone()
+    esposa_joao.firstname = 'Ninguém'
+    print(joao._enderecos[0] is esposa_joao._enderecos[0])  # compartilhado
+
+    esposa_joao.addresses[0].number = '1500'  # copia só este Address
+    esposa_joao.add_address(Address('Rua Y', '10'))
+    print(joao)
+    print(esposa_joao)
+
+    _benchmark()
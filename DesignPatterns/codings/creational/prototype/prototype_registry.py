@@ -0,0 +1,182 @@
+"""
+Registro de protótipos com pool de clones pré-aquecido
+
+Quando os mesmos poucos protótipos são clonados milhares de vezes por
+segundo, o custo do clone fica no caminho crítico. O PrototypeRegistry
+guarda os protótipos por nome e mantém, para cada um, um pool de clones
+prontos que uma thread em segundo plano reabastece:
+
+    . registry.get('joao') tira um clone pronto do pool (um popleft em uma
+    deque, sem lock); se o pool estiver vazio, clona na hora (miss)
+
+    . a thread de reabastecimento acorda quando alguém consome do pool e o
+    completa até o tamanho configurado
+
+    . metrics() expõe acertos, faltas, taxa de acerto e o atraso de
+    reabastecimento (do primeiro consumo até o pool voltar a ficar cheio)
+
+Os clones do pool são tirados do protótipo no momento do registro (ou da
+recarga). Registrar de novo o mesmo nome troca o pool inteiro; quem alterar
+o protótipo no lugar deve chamar refresh(nome), senão o pool continua
+entregando cópias do estado antigo.
+
+Os contadores são atualizados sem lock e podem perder incrementos sob
+concorrência: servem como métrica, não como contabilidade exata.
+"""
+
+from collections import deque
+from copy import deepcopy
+from threading import Event, Lock, Thread
+from time import perf_counter
+
+from .prototype import Address, Person
+
+
+class _Entrada:
+    __slots__ = ('prototipo', 'tamanho', 'pool', 'hits', 'misses',
+                 'falta_desde', 'atraso_total', 'atraso_max', 'recargas')
+
+    def __init__(self, prototipo, tamanho):
+        self.prototipo = prototipo
+        self.tamanho = tamanho
+        self.pool = deque()
+        self.hits = 0
+        self.misses = 0
+        self.falta_desde = None
+        self.atraso_total = 0.0
+        self.atraso_max = 0.0
+        self.recargas = 0
+
+    def clona(self):
+        clone = getattr(self.prototipo, 'clone', None)
+        return clone() if clone is not None else deepcopy(self.prototipo)
+
+
+class PrototypeRegistry:
+    def __init__(self, pool_size=32, intervalo=0.05):
+        self._pool_size = pool_size
+        self._intervalo = intervalo
+        self._entradas = {}
+        self._lock = Lock()
+        self._acorda = Event()
+        self._parar = Event()
+        self._thread = None
+
+    def register(self, nome, prototipo, pool_size=None):
+        entrada = _Entrada(prototipo, pool_size or self._pool_size)
+        entrada.pool.extend(entrada.clona() for _ in range(entrada.tamanho))
+        with self._lock:
+            self._entradas[nome] = entrada
+
+    def refresh(self, nome):
+        """Descarta os clones prontos; use depois de alterar o protótipo."""
+        entrada = self._entradas[nome]
+        # Troca a deque inteira: uma recarga em andamento enche a antiga
+        entrada.pool = deque(entrada.clona() for _ in range(entrada.tamanho))
+
+    def unregister(self, nome):
+        with self._lock:
+            del self._entradas[nome]
+
+    def get(self, nome):
+        entrada = self._entradas[nome]
+        try:
+            clone = entrada.pool.popleft()
+            entrada.hits += 1
+        except IndexError:
+            clone = entrada.clona()
+            entrada.misses += 1
+        if entrada.falta_desde is None:
+            entrada.falta_desde = perf_counter()
+            self._acorda.set()
+        return clone
+
+    # -------------------------------------------------------------------
+    # Reabastecimento
+    # -------------------------------------------------------------------
+    def _reabastece(self):
+        while not self._parar.is_set():
+            self._acorda.wait(self._intervalo)
+            self._acorda.clear()
+            with self._lock:
+                entradas = list(self._entradas.values())
+            for entrada in entradas:
+                desde = entrada.falta_desde
+                if desde is None:
+                    continue
+                # Zera antes de encher: um get concorrente reabre a janela e
+                # garante uma nova passada, em vez de se perder
+                entrada.falta_desde = None
+                pool = entrada.pool
+                while len(pool) < entrada.tamanho:
+                    pool.append(entrada.clona())
+                atraso = perf_counter() - desde
+                entrada.recargas += 1
+                entrada.atraso_total += atraso
+                entrada.atraso_max = max(entrada.atraso_max, atraso)
+
+    def start(self):
+        if self._thread is None:
+            self._parar.clear()
+            self._thread = Thread(target=self._reabastece, daemon=True,
+                                  name='prototype-registry-refill')
+            self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._parar.set()
+            self._acorda.set()
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def metrics(self):
+        with self._lock:
+            entradas = dict(self._entradas)
+        resultado = {}
+        for nome, e in entradas.items():
+            total = e.hits + e.misses
+            resultado[nome] = {
+                'hits': e.hits,
+                'misses': e.misses,
+                'hit_rate': e.hits / total if total else 0.0,
+                'pool': len(e.pool),
+                'refills': e.recargas,
+                'refill_lag_avg': (e.atraso_total / e.recargas
+                                   if e.recargas else 0.0),
+                'refill_lag_max': e.atraso_max,
+            }
+        return resultado
+
+
+if __name__ == "__main__":
+    from time import sleep
+
+    joao = Person('João', 'Justino')
+    joao.add_address(Address('Rua X', '1444'))
+
+    with PrototypeRegistry(pool_size=64) as registry:
+        registry.register('joao', joao)
+
+        # Rajadas de 50 clones com pausas: o pool se recupera entre elas
+        for _ in range(20):
+            clones = [registry.get('joao') for _ in range(50)]
+            sleep(0.01)
+
+        clones[0].firstname = 'Ninguém'
+        print(clones[0])
+        print(joao)
+
+        # Protótipo alterado no lugar: refresh descarta as cópias antigas
+        joao.add_address(Address('Rua Y', '10'))
+        assert len(registry.get('joao').addresses) == 1
+        registry.refresh('joao')
+        assert len(registry.get('joao').addresses) == 2
+        for nome, metricas in registry.metrics().items():
+            print(nome, {k: round(v, 4) for k, v in metricas.items()})
@@ -0,0 +1,156 @@
+"""
+Mixin de repr compartilhado pelos exemplos de builder, prototype e singleton
+
+O StringReprMixin gera, uma vez por classe e por layout de atributos, um
+__str__ especializado (uma f-string compilada), guarda em cache e o instala
+direto na classe. Funciona com __dict__ e com __slots__ e devolve '...' em
+referências cíclicas.
+
+O cache é limitado: cada classe compila no máximo MAX_LAYOUTS layouts.
+Classes cujo __dict__ não para de ganhar chaves (como os monostates, que
+compartilham um dict só) passam a usar o repr genérico depois disso.
+
+Cada exemplo define o seu mixin como subclasse, só para escolher o separador
+entre o nome da classe e os parâmetros ('User (...)' ou 'Person(...)').
+"""
+from threading import get_ident
+from typing import Dict, Set
+
+MAX_LAYOUTS = 8
+
+# Cache de reprs gerados, por (classe, layout dos atributos)
+_repr_cache: Dict = {}
+# Classe -> quantos layouts já foram compilados para ela
+_layouts: Dict = {}
+# Objetos cujo repr está em andamento, por thread (guarda de recursão)
+_repr_em_andamento: Set = set()
+
+
+def _nomes_slots(cls):
+    nomes = []
+    for base in reversed(cls.__mro__):
+        slots = base.__dict__.get('__slots__', ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        nomes += [s for s in slots if s not in ('__dict__', '__weakref__')]
+    return tuple(nomes)
+
+
+def _repr_generico(obj):
+    # Mesma guarda de recursão do caminho compilado
+    chave = id(obj), get_ident()
+    if chave in _repr_em_andamento:
+        return '...'
+    _repr_em_andamento.add(chave)
+    try:
+        nomes = (*_nomes_slots(obj.__class__),
+                 *getattr(obj, '__dict__', ()))
+        params = ', '.join(
+            [f"{k}={getattr(obj, k)}" for k in nomes if hasattr(obj, k)]
+        )
+    finally:
+        _repr_em_andamento.discard(chave)
+    return f"{obj.__class__.__name__}{obj._repr_separador}({params})"
+
+
+def _gera_repr(cls, layout):
+    """Compila um __str__ específico para a classe e o layout dado."""
+    slots = _nomes_slots(cls)
+    ambiente = {
+        'C': cls, 'L': layout, '_em': _repr_em_andamento,
+        'get_ident': get_ident, '_despacha': _despacha_repr,
+        '_generico': _repr_generico,
+    }
+    campos = [f"{n}={{self.{n}}}" for n in slots]
+    for i, k in enumerate(layout or ()):
+        if not k.isidentifier():
+            return _repr_generico
+        ambiente[f'k{i}'] = k
+        campos.append(f"{k}={{d[k{i}]}}")
+
+    if layout is None:
+        cabecalho = ["    if self.__class__ is not C:"]
+    else:
+        cabecalho = ["    d = self.__dict__",
+                     "    if self.__class__ is not C or tuple(d) != L:"]
+    prefixo = cls.__name__ + cls._repr_separador
+    codigo = '\n'.join([
+        "def __str__(self):",
+        *cabecalho,
+        "        return _despacha(self)",
+        "    chave = id(self), get_ident()",
+        "    if chave in _em:",
+        "        return '...'",
+        "    _em.add(chave)",
+        "    try:",
+        f"        return f\"{prefixo}({', '.join(campos)})\"",
+        "    except AttributeError:",
+        "        return _generico(self)",
+        "    finally:",
+        "        _em.discard(chave)",
+    ])
+    exec(codigo, ambiente)
+    funcao = ambiente['__str__']
+    funcao._repr_classe = cls
+    return funcao
+
+
+def _despacha_repr(obj):
+    cls = obj.__class__
+    d = getattr(obj, '__dict__', None)
+    chave = (cls, None if d is None else tuple(d))
+    funcao = _repr_cache.get(chave)
+    if funcao is None:
+        if _layouts.get(cls, 0) >= MAX_LAYOUTS:
+            return _repr_generico(obj)
+        _layouts[cls] = _layouts.get(cls, 0) + 1
+        funcao = _repr_cache[chave] = _gera_repr(cls, chave[1])
+
+    # Instala direto na classe (sem o salto pelo mixin) se ela não tiver
+    # sobrescrito __str__/__repr__ e ainda não tiver um repr próprio
+    padrao = (StringReprMixin.__str__, StringReprMixin.__repr__)
+    atuais = (cls.__str__, cls.__repr__)
+    if all(f in padrao or hasattr(f, '_repr_classe') for f in atuais) \
+            and getattr(cls.__str__, '_repr_classe', None) is not cls \
+            and hasattr(funcao, '_repr_classe'):
+        cls.__str__ = cls.__repr__ = funcao
+    return funcao(obj)
+
+
+class StringReprMixin:
+    """
+    Gera, uma vez por classe e por layout de atributos, um __str__
+    especializado (uma f-string compilada) e o guarda em cache. Funciona com
+    __dict__ e com __slots__ e devolve '...' em referências cíclicas.
+    """
+    __slots__ = ()
+    _repr_separador = ''
+
+    def __str__(self) -> str:
+        return _despacha_repr(self)
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+
+def _verifica():
+    """Ciclos no caminho genérico: layouts demais e chaves estranhas."""
+    class No(StringReprMixin):
+        pass
+
+    for i in range(MAX_LAYOUTS + 2):  # os últimos já caem no genérico
+        no = No()
+        setattr(no, f'a{i}', i)
+        no.proximo = no
+        assert repr(no) == f'No(a{i}={i}, proximo=...)', repr(no)
+
+    no = No()
+    setattr(no, 'não-identificador', 1)
+    no.proximo = no
+    assert repr(no) == 'No(não-identificador=1, proximo=...)', repr(no)
+    assert not _repr_em_andamento
+    print('ciclos no repr genérico ok')
+
+
+if __name__ == "__main__":
+    _verifica()
@@ -0,0 +1,134 @@
+"""
+Singleton com inicialização assíncrona (single-flight)
+
+A metaclasse do singleton3.py e o decorator do singleton2.py só chamam um
+__init__ síncrono. Quando a instância precisa de um setup assíncrono (abrir
+e aquecer um pool de conexões, por exemplo) a subclasse de AsyncSingleton
+implementa `async def inicializar(self)` e todos pedem a instância com
+
+    settings = await AppSettings.instance()
+
+    . a primeira chamada cria uma task de inicialização; as chamadas que
+    chegam enquanto ela roda aguardam a mesma task, então o setup roda uma
+    única vez (single-flight)
+
+    . se o setup falhar, a exceção chega a todos que estavam aguardando e a
+    próxima chamada tenta de novo do zero
+
+    . a task é protegida com asyncio.shield: cancelar quem espera não
+    cancela a inicialização dos outros
+"""
+import asyncio
+
+
+class AsyncSingleton:
+    _instance = None
+    _inicializando = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._instance = None
+        cls._inicializando = None
+
+    async def inicializar(self):
+        """Setup assíncrono; sobrescreva nas subclasses."""
+
+    @classmethod
+    async def _cria(cls, args, kwargs):
+        try:
+            obj = cls(*args, **kwargs)
+            await obj.inicializar()
+        except BaseException:
+            cls._inicializando = None  # libera uma nova tentativa
+            raise
+        cls._instance = obj
+        cls._inicializando = None
+        return obj
+
+    @classmethod
+    async def instance(cls, *args, **kwargs):
+        obj = cls._instance
+        if obj is not None:
+            return obj
+        task = cls._inicializando
+        if task is None:
+            task = cls._inicializando = asyncio.ensure_future(
+                cls._cria(args, kwargs)
+            )
+        return await asyncio.shield(task)
+
+
+class AppSettings(AsyncSingleton):
+    inicializacoes = 0
+    falhas_restantes = 0
+
+    def __init__(self) -> None:
+        self.tema = 'O tema escuro'
+        self.font = '18px'
+        self.pool = []
+
+    async def inicializar(self):
+        AppSettings.inicializacoes += 1
+        await asyncio.sleep(0.01)  # simula o aquecimento de um pool
+        if AppSettings.falhas_restantes:
+            AppSettings.falhas_restantes -= 1
+            raise ConnectionError('falha ao aquecer o pool')
+        self.pool = [f'conexao-{i}' for i in range(4)]
+
+
+class AppSettingsIngenuo:
+    """Controle: checa e cria sem compartilhar a inicialização em curso."""
+    _instance = None
+    inicializacoes = 0
+
+    @classmethod
+    async def instance(cls):
+        if cls._instance is None:
+            cls.inicializacoes += 1
+            await asyncio.sleep(0.01)
+            cls._instance = cls()
+        return cls._instance
+
+
+async def _benchmark(n=10_000):
+    from time import perf_counter
+
+    for cls in (AppSettingsIngenuo, AppSettings):
+        t0 = perf_counter()
+        instancias = await asyncio.gather(
+            *(cls.instance() for _ in range(n))
+        )
+        duracao = perf_counter() - t0
+        print(f'{cls.__name__:>18}: {n} chamadas concorrentes, '
+              f'{cls.inicializacoes} inicializações, '
+              f'{len({id(i) for i in instancias})} instâncias distintas, '
+              f'{duracao * 1000:.1f} ms')
+
+    t0 = perf_counter()
+    for _ in range(n):
+        await AppSettings.instance()
+    print(f'{"caminho rápido":>18}: '
+          f'{(perf_counter() - t0) / n * 1e9:.0f} ns por chamada')
+
+
+async def _demo():
+    # Falha na primeira tentativa: todos recebem a exceção
+    AppSettings.falhas_restantes = 1
+    resultados = await asyncio.gather(
+        *(AppSettings.instance() for _ in range(3)), return_exceptions=True
+    )
+    print([type(r).__name__ for r in resultados],
+          AppSettings.inicializacoes)
+
+    # Nova tentativa depois da falha
+    as1, as2 = await asyncio.gather(AppSettings.instance(),
+                                    AppSettings.instance())
+    print(as1 is as2, as1.pool, AppSettings.inicializacoes)
+
+    AppSettings._instance = None
+    AppSettings.inicializacoes = 0
+    await _benchmark()
+
+
+if __name__ == "__main__":
+    asyncio.run(_demo())
@@ -0,0 +1,133 @@
+"""
+AppSettings recarregável a partir de um arquivo
+
+O HotAppSettings é um singleton (metaclasse Singleton do singleton3) cujas
+configurações (tema, font, ...) vêm de um arquivo JSON:
+
+    . as configurações ficam no __dict__ da instância, então ler
+    `settings.tema` continua sendo um acesso a atributo comum, sem lock e
+    sem nenhuma checagem extra
+
+    . uma thread em segundo plano consulta o os.stat do arquivo (inode,
+    mtime e tamanho) e, quando algo muda, monta um dict novo e o troca de
+    uma vez (`self.__dict__ = novo`). Quem lê vê o snapshot antigo inteiro
+    ou o novo inteiro, nunca uma mistura (é a mesma troca de __dict__ do
+    Monostate)
+
+    . o snapshot é imutável: atribuir atributos levanta AttributeError
+
+Um arquivo inválido mantém o snapshot anterior e fica registrado em
+`ultimo_erro`; isso inclui chaves com o nome de um atributo ou método da
+classe (`recargas`, `snapshot`, `stop`, ...), que seriam escondidas por ele.
+`latencia_recarga` mede o tempo entre o mtime do arquivo e a troca do
+snapshot; fica None até a primeira recarga (na carga inicial ela mediria só
+a idade do arquivo).
+"""
+import json
+import os
+from threading import Event, Thread
+from time import time
+from types import MappingProxyType
+
+from .singleton3 import Singleton
+
+
+class HotAppSettings(metaclass=Singleton):
+    __slots__ = ('__dict__', '_caminho', '_intervalo', '_assinatura',
+                 '_parar', '_thread', 'recargas', 'latencia_recarga',
+                 'ultimo_erro')
+
+    def __init__(self, caminho, intervalo=0.5):
+        definir = object.__setattr__
+        definir(self, '_caminho', caminho)
+        definir(self, '_intervalo', intervalo)
+        definir(self, '_assinatura', None)
+        definir(self, '_parar', Event())
+        definir(self, 'recargas', 0)
+        definir(self, 'latencia_recarga', None)
+        definir(self, 'ultimo_erro', None)
+        self._recarrega()
+        definir(self, '_thread', Thread(
+            target=self._observa, daemon=True, name='hot-settings-watcher'
+        ))
+        self._thread.start()
+
+    @staticmethod
+    def _assinatura_de(estado):
+        return estado.st_ino, estado.st_mtime_ns, estado.st_size
+
+    def _recarrega(self):
+        definir = object.__setattr__
+        try:
+            estado = os.stat(self._caminho)
+            assinatura = self._assinatura_de(estado)
+            if assinatura == self._assinatura:
+                return False
+            with open(self._caminho, encoding='utf-8') as arquivo:
+                novo = json.load(arquivo)
+            if not isinstance(novo, dict):
+                raise ValueError('o arquivo deve conter um objeto JSON')
+            reservadas = sorted(k for k in novo if hasattr(HotAppSettings, k))
+            if reservadas:
+                raise ValueError(f'chaves reservadas no arquivo: {reservadas}')
+        except (OSError, ValueError) as erro:
+            definir(self, 'ultimo_erro', erro)
+            return False
+
+        inicial = self._assinatura is None
+        definir(self, '__dict__', novo)  # troca atômica do snapshot
+        definir(self, '_assinatura', assinatura)
+        definir(self, 'recargas', self.recargas + 1)
+        if not inicial:
+            definir(self, 'latencia_recarga', time() - estado.st_mtime)
+        definir(self, 'ultimo_erro', None)
+        return True
+
+    def _observa(self):
+        while not self._parar.wait(self._intervalo):
+            self._recarrega()
+
+    @property
+    def snapshot(self):
+        return MappingProxyType(self.__dict__)
+
+    def stop(self):
+        self._parar.set()
+        self._thread.join()
+
+    def __setattr__(self, nome, valor):
+        raise AttributeError(
+            'HotAppSettings é somente leitura; altere o arquivo de origem'
+        )
+
+
+if __name__ == "__main__":
+    import tempfile
+    from time import sleep
+
+    def grava(caminho, **valores):
+        # Grava em um temporário e renomeia: o leitor nunca vê meio arquivo
+        temporario = caminho + '.tmp'
+        with open(temporario, 'w', encoding='utf-8') as arquivo:
+            json.dump(valores, arquivo)
+        os.replace(temporario, caminho)
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, 'settings.json')
+        grava(caminho, tema='O tema escuro', font='18px')
+
+        settings = HotAppSettings(caminho, intervalo=0.05)
+        print(settings.tema, settings.font, settings is HotAppSettings(''))
+        assert settings.latencia_recarga is None  # carga inicial não conta
+
+        # Chave que esconderia um atributo: o snapshot anterior fica
+        grava(caminho, tema='Outro tema', recargas=99)
+        sleep(0.2)
+        print(settings.tema, settings.recargas, settings.ultimo_erro)
+
+        grava(caminho, tema='O tema claro', font='16px')
+        sleep(0.2)
+        print(settings.tema, settings.font, dict(settings.snapshot))
+        print(f'recargas={settings.recargas}, '
+              f'latência={settings.latencia_recarga * 1000:.1f} ms')
+        settings.stop()
@@ -3,15 +3,12 @@ Monostate (ou Borg) - É uma variação do Singleton proposto por Alex Martelli
 que tem a itenção de garantir que o estado do objeto seja igual para todas as
 instâncias
 """
+from ..repr_mixin import StringReprMixin
 
 
-class StringReprMixing:
-    def __str__(self) -> str:
-        params = ', '.join([f"{k}={v}" for k, v in self.__dict__.items()])
-        return f"{self.__class__.__name__} ({params})"
-
-    def __repr__(self) -> str:
-        return self.__str__()
+class StringReprMixing(StringReprMixin):
+    __slots__ = ()
+    _repr_separador = ' '
 
 
 class MonoStateSimple(StringReprMixing):
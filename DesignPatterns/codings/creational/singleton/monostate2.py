@@ -7,16 +7,7 @@ from __future__ import annotations
 
 from typing import Dict
 
-
-class StringReprMixin:
-    def __str__(self) -> str:
-        params = ', '.join(
-            [f'{k}={v}' for k, v in self.__dict__.items()]
-        )
-        return f'{self.__class__.__name__}({params})'
-
-    def __repr__(self) -> str:
-        return self.__str__()
+from ..repr_mixin import StringReprMixin
 
 
 class MonoState(StringReprMixin):
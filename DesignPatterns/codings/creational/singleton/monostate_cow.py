@@ -0,0 +1,242 @@
+"""
+Monostate versionado com cópia na escrita (copy-on-write)
+
+No MonoState do monostate2.py todas as instâncias mutam o mesmo dict no
+lugar: quem lê em outra thread pode ver uma atualização de vários atributos
+pela metade, e não há como tirar uma fotografia consistente do estado.
+
+Aqui o estado é uma sequência de versões imutáveis (Snapshot):
+
+    . quem escreve copia a versão atual, aplica a mudança e publica a nova
+    versão trocando uma única referência; os escritores se revezam em um
+    lock, quem lê nunca pega lock
+
+    . obj.snapshot() devolve a versão atual inteira; atributos lidos dela
+    são sempre da mesma versão
+
+    . `with obj.atualizar() as estado:` junta várias mudanças em uma só
+    versão, publicada ao sair do bloco (e descartada se houver exceção).
+    A versão publicada é uma cópia do rascunho, então mexer em `estado`
+    depois do bloco não altera nada. Um atualizar() (ou obj.x = ...)
+    dentro de outro, na mesma thread, escreve no rascunho de fora
+
+Como no MonoState, subclasses compartilham o estado da classe base, a menos
+que declarem o próprio `_estado = _Celula()`.
+"""
+from __future__ import annotations
+
+from collections.abc import Mapping
+from contextlib import contextmanager
+from threading import Lock, get_ident
+
+
+class Snapshot(Mapping):
+    """
+    Uma versão imutável do estado; aceita s['x'] e s.x. Os valores ficam no
+    __dict__ da própria versão, então s.x é um acesso a atributo comum.
+    """
+    __slots__ = ('__dict__', 'versao')
+
+    def __init__(self, versao, valores):
+        object.__setattr__(self, 'versao', versao)
+        object.__setattr__(self, '__dict__', valores)
+
+    def __getitem__(self, chave):
+        return self.__dict__[chave]
+
+    def __iter__(self):
+        return iter(self.__dict__)
+
+    def __len__(self):
+        return len(self.__dict__)
+
+    def __setattr__(self, nome, valor):
+        raise AttributeError('Snapshot é imutável')
+
+    def __delattr__(self, nome):
+        raise AttributeError('Snapshot é imutável')
+
+    def __repr__(self):
+        return f'Snapshot(v{self.versao}, {self.__dict__})'
+
+
+class _Celula:
+    """
+    Guarda a versão atual; trocar `atual` é a publicação atômica. `dono` é a
+    thread que segura o lock e `rascunho` o dict que ela está editando.
+    """
+    __slots__ = ('atual', 'lock', 'dono', 'rascunho')
+
+    def __init__(self, **valores):
+        self.atual = Snapshot(0, valores)
+        self.lock = Lock()
+        self.dono = None
+        self.rascunho = None
+
+
+class VersionedMonoState:
+    __slots__ = ()
+    _estado = _Celula()
+
+    def __init__(self, nome=None, sobrenome=None) -> None:
+        if nome is not None or sobrenome is not None:
+            with self.atualizar() as estado:
+                if nome is not None:
+                    estado['nome'] = nome
+                if sobrenome is not None:
+                    estado['sobrenome'] = sobrenome
+
+    def snapshot(self) -> Snapshot:
+        return self._estado.atual
+
+    @contextmanager
+    def atualizar(self):
+        celula = self._estado
+        if celula.dono == get_ident():
+            # Aninhado: a versão sai junto com a do bloco de fora
+            yield celula.rascunho
+            return
+        with celula.lock:
+            atual = celula.atual
+            celula.rascunho = rascunho = atual.__dict__.copy()
+            celula.dono = get_ident()
+            try:
+                yield rascunho
+            finally:
+                celula.dono = celula.rascunho = None
+            celula.atual = Snapshot(atual.versao + 1, dict(rascunho))
+
+    def __getattr__(self, nome):
+        try:
+            return self._estado.atual.__dict__[nome]
+        except KeyError:
+            raise AttributeError(nome) from None
+
+    def __setattr__(self, nome, valor):
+        with self.atualizar() as estado:
+            estado[nome] = valor
+
+    def __delattr__(self, nome):
+        with self.atualizar() as estado:
+            try:
+                del estado[nome]
+            except KeyError:
+                raise AttributeError(nome) from None
+
+    def __repr__(self):
+        atual = self._estado.atual
+        params = ', '.join(f'{k}={v}' for k, v in atual.items())
+        return f'{self.__class__.__name__}(v{atual.versao}, {params})'
+
+
+class B(VersionedMonoState):
+    pass
+
+
+def _benchmark(segundos=1.0, leitores=4, escritores=2):
+    """
+    Leitores e escritores concorrentes. Os escritores mantêm x == y; um
+    leitor que vê x != y pegou uma atualização pela metade.
+    """
+    import sys
+    from threading import Event, Thread
+    from time import perf_counter, sleep
+
+    from .monostate2 import MonoState
+
+    class Dict(MonoState):
+        _state = {'x': 0, 'y': 0}
+
+    class Cow(VersionedMonoState):
+        _estado = _Celula(x=0, y=0)
+
+    def escreve_dict(obj, parar, contagem):
+        i = 0
+        while not parar.is_set():
+            i += 1
+            obj.x = i
+            obj.y = _valor(i)
+        contagem.append(i)
+
+    def le_dict(obj, parar, contagem, rasgadas):
+        n = r = 0
+        while not parar.is_set():
+            n += 1
+            if obj.x != obj.y:
+                r += 1
+        contagem.append(n)
+        rasgadas.append(r)
+
+    def escreve_cow(obj, parar, contagem):
+        i = 0
+        while not parar.is_set():
+            i += 1
+            with obj.atualizar() as estado:
+                estado['x'] = i
+                estado['y'] = _valor(i)
+        contagem.append(i)
+
+    def le_cow(obj, parar, contagem, rasgadas):
+        n = r = 0
+        while not parar.is_set():
+            n += 1
+            s = obj.snapshot()
+            if s.x != s.y:
+                r += 1
+        contagem.append(n)
+        rasgadas.append(r)
+
+    def _valor(i):
+        # Uma chamada entre as duas escritas, como em qualquer atualização
+        # real: é nela que o interpretador pode trocar de thread
+        return i
+
+    casos = {
+        'dict compartilhado': (Dict(), escreve_dict, le_dict),
+        'copy-on-write': (Cow(), escreve_cow, le_cow),
+    }
+    intervalo = sys.getswitchinterval()
+    sys.setswitchinterval(1e-5)
+    try:
+        for nome, (obj, escreve, le) in casos.items():
+            parar = Event()
+            escritas, leituras, rasgadas = [], [], []
+            threads = [
+                Thread(target=escreve, args=(obj, parar, escritas))
+                for _ in range(escritores)
+            ] + [
+                Thread(target=le, args=(obj, parar, leituras, rasgadas))
+                for _ in range(leitores)
+            ]
+            t0 = perf_counter()
+            for t in threads:
+                t.start()
+            sleep(segundos)
+            parar.set()
+            for t in threads:
+                t.join()
+            duracao = perf_counter() - t0
+            print(f'{nome:>18}: {sum(leituras) / duracao:>10,.0f} leituras/s,'
+                  f' {sum(escritas) / duracao:>9,.0f} escritas/s, '
+                  f'{sum(rasgadas)} leituras inconsistentes')
+    finally:
+        sys.setswitchinterval(intervalo)
+
+
+if __name__ == "__main__":
+    m1 = VersionedMonoState(nome='Luiz')
+    m2 = B(sobrenome='Miranda')
+    antes = m1.snapshot()
+    with m2.atualizar() as estado:
+        estado['nome'] = 'Otávio'
+        estado['idade'] = 30
+    print(m1)
+    print(m2)
+    print(antes)
+
+    estado['nome'] = 'Depois'  # o rascunho não é a versão publicada
+    with m1.atualizar() as estado:
+        m1.cidade = 'Recife'  # aninhado: entra na mesma versão
+        estado['idade'] = 31
+    print(m1.snapshot())
+    _benchmark()
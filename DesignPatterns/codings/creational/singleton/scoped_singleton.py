@@ -0,0 +1,208 @@
+"""
+Singletons com escopo (por thread, por task asyncio ou por escopo explícito)
+
+O decorator `singleton` do singleton2.py guarda uma instância global por
+classe. Para objetos caros que devem existir uma vez por requisição (uma
+conexão, um cache, uma sessão) isso obriga a passar o objeto à mão ou a
+proteger o global com locks. Aqui `scoped_singleton(tipo)` troca o global
+por uma instância por escopo:
+
+    . 'thread': uma instância por thread, liberada quando a thread termina
+
+    . 'task': uma instância por task asyncio, liberada quando a task termina
+
+    . 'scope': uma instância por bloco `with escopo():`, liberada na saída
+    do bloco. Tasks criadas dentro do bloco herdam o escopo (contextvars)
+
+A busca é um ContextVar.get (ou um getattr no threading.local) seguido de
+um dict.get. Na liberação, instâncias com método close() são fechadas, da
+mais nova para a mais antiga.
+"""
+from asyncio import current_task
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import local
+from weakref import finalize
+
+
+def _fecha(instancias):
+    for obj in reversed(list(instancias.values())):
+        close = getattr(obj, 'close', None)
+        if close is not None:
+            close()
+    instancias.clear()
+
+
+class Escopo:
+    __slots__ = ('instancias', '__weakref__')
+
+    def __init__(self):
+        self.instancias = {}
+
+    def fechar(self):
+        _fecha(self.instancias)
+
+
+_threads = local()
+_da_task: ContextVar = ContextVar('escopo_da_task', default=None)
+_explicito: ContextVar = ContextVar('escopo_explicito', default=None)
+
+
+def _escopo_thread():
+    escopo = getattr(_threads, 'escopo', None)
+    if escopo is None:
+        escopo = _threads.escopo = Escopo()
+        # O threading.local solta o escopo quando a thread termina
+        finalize(escopo, _fecha, escopo.instancias)
+    return escopo
+
+
+def _escopo_task():
+    try:
+        task = current_task()
+    except RuntimeError:
+        task = None
+    if task is None:
+        raise RuntimeError("scoped_singleton('task') fora de uma task asyncio")
+    # A task herda o ContextVar de quem a criou; o par (task, escopo)
+    # garante que ela não reaproveite o escopo da task mãe
+    atual = _da_task.get()
+    if atual is not None and atual[0] is task:
+        return atual[1]
+    escopo = Escopo()
+    _da_task.set((task, escopo))
+    task.add_done_callback(lambda _: escopo.fechar())
+    return escopo
+
+
+def _escopo_explicito():
+    escopo = _explicito.get()
+    if escopo is None:
+        raise RuntimeError(
+            "scoped_singleton('scope') fora de um bloco `with escopo():`"
+        )
+    return escopo
+
+
+_ESCOPOS = {
+    'thread': _escopo_thread,
+    'task': _escopo_task,
+    'scope': _escopo_explicito,
+}
+
+
+@contextmanager
+def escopo():
+    novo = Escopo()
+    token = _explicito.set(novo)
+    try:
+        yield novo
+    finally:
+        _explicito.reset(token)
+        novo.fechar()
+
+
+def scoped_singleton(tipo='thread'):
+    try:
+        escopo_atual = _ESCOPOS[tipo]
+    except KeyError:
+        raise ValueError(
+            f'Escopo {tipo!r} inválido; use um de {sorted(_ESCOPOS)}'
+        ) from None
+
+    def decorator(the_class):
+        def get_class(*args, **kwargs):
+            instancias = escopo_atual().instancias
+            obj = instancias.get(the_class)
+            if obj is None:
+                obj = instancias[the_class] = the_class(*args, **kwargs)
+            return obj
+
+        get_class.__wrapped__ = the_class
+        return get_class
+
+    return decorator
+
+
+class _Recurso:
+    abertos = 0
+
+    def __init__(self) -> None:
+        _Recurso.abertos += 1
+        self.fechado = False
+
+    def close(self):
+        _Recurso.abertos -= 1
+        self.fechado = True
+
+
+@scoped_singleton('thread')
+class ConexaoPorThread(_Recurso):
+    pass
+
+
+@scoped_singleton('task')
+class SessaoPorTask(_Recurso):
+    pass
+
+
+@scoped_singleton('scope')
+class CachePorRequisicao(_Recurso):
+    pass
+
+
+def _benchmark(n=1_000_000):
+    from timeit import repeat
+
+    from .singleton2 import AppSettings
+
+    casos = {'singleton2 (global)': AppSettings,
+             "scoped_singleton('thread')": ConexaoPorThread}
+    with escopo():
+        casos["scoped_singleton('scope')"] = CachePorRequisicao
+        for nome, fabrica in casos.items():
+            fabrica()
+            melhor = min(repeat(fabrica, number=n, repeat=5))
+            print(f'{nome:>28}: {melhor / n * 1e9:.0f} ns por chamada')
+
+
+if __name__ == "__main__":
+    import asyncio
+    import gc
+    from threading import Thread
+
+    # Por thread
+    ids = []
+    threads = [Thread(target=lambda: ids.append(
+        (id(ConexaoPorThread()), ConexaoPorThread() is ConexaoPorThread())
+    )) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    gc.collect()
+    print('thread:', ids, 'abertos =', _Recurso.abertos)
+
+    # Por task
+    async def requisicao():
+        sessao = SessaoPorTask()
+        await asyncio.sleep(0)
+        return sessao, SessaoPorTask() is sessao
+
+    async def principal():
+        resultados = await asyncio.gather(*(requisicao() for _ in range(3)))
+        await asyncio.sleep(0)  # deixa os done callbacks rodarem
+        return resultados
+
+    resultados = asyncio.run(principal())
+    print('task:', len({id(s) for s, _ in resultados}), 'sessões,',
+          all(mesma for _, mesma in resultados),
+          all(s.fechado for s, _ in resultados))
+
+    # Por escopo explícito
+    with escopo():
+        cache = CachePorRequisicao()
+        print('scope:', cache is CachePorRequisicao(), cache.fechado)
+    print('scope:', cache.fechado, 'abertos =', _Recurso.abertos)
+
+    _benchmark()
@@ -0,0 +1,182 @@
+"""
+AppSettings compartilhado entre processos
+
+Cada worker costuma recriar e recarregar o próprio AppSettings. Aqui o
+processo principal serializa as configurações uma única vez em um segmento
+de multiprocessing.shared_memory, e os workers apenas anexam esse segmento
+(somente leitura) pelo nome:
+
+    . SettingsPublisher (processo principal) escreve as configurações em
+    JSON e incrementa um contador de versão
+
+    . SharedAppSettings (em cada worker) é um singleton por processo; a
+    cada leitura de atributo ele confere a versão (8 bytes) e só volta a
+    decodificar o JSON quando ela mudou
+
+A versão funciona como um seqlock: fica ímpar durante a escrita, e o leitor
+repete a leitura se pegar uma versão ímpar ou se ela mudar no meio. Só pode
+haver um publicador por segmento. Se o publicador morrer no meio de uma
+escrita a versão fica ímpar para sempre; depois de `TIMEOUT_LEITURA`
+segundos tentando, o leitor levanta TimeoutError em vez de girar sem fim.
+
+Como o singleton é por processo, pedir SharedAppSettings com um nome de
+segmento diferente do primeiro levanta ValueError (até um close()).
+"""
+import json
+import struct
+from multiprocessing import shared_memory
+from time import monotonic
+
+from .singleton3 import Singleton
+
+# Cabeçalho: versão (q) e tamanho do JSON (q)
+_CABECALHO = struct.Struct('qq')
+TIMEOUT_LEITURA = 1.0
+
+
+class SettingsPublisher:
+    def __init__(self, nome=None, capacidade=64 * 1024, **valores):
+        self._shm = shared_memory.SharedMemory(
+            name=nome, create=True, size=_CABECALHO.size + capacidade
+        )
+        self._capacidade = capacidade
+        _CABECALHO.pack_into(self._shm.buf, 0, 0, 0)
+        self.publish(**valores)
+
+    @property
+    def nome(self):
+        return self._shm.name
+
+    def publish(self, **valores):
+        dados = json.dumps(valores).encode('utf-8')
+        if len(dados) > self._capacidade:
+            raise ValueError(
+                f'Configurações com {len(dados)} bytes excedem a '
+                f'capacidade de {self._capacidade} bytes'
+            )
+        buf = self._shm.buf
+        versao = struct.unpack_from('q', buf, 0)[0]
+        struct.pack_into('q', buf, 0, versao + 1)  # ímpar: escrevendo
+        inicio = _CABECALHO.size
+        buf[inicio:inicio + len(dados)] = dados
+        struct.pack_into('q', buf, 8, len(dados))
+        struct.pack_into('q', buf, 0, versao + 2)  # par: consistente
+        return versao + 2
+
+    def close(self):
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class _SingletonPorSegmento(Singleton):
+    def __call__(cls, nome):
+        instancia = super().__call__(nome)
+        if instancia.nome != nome:
+            raise ValueError(
+                f'{cls.__name__} já está anexado a {instancia.nome!r}, '
+                f'não a {nome!r}'
+            )
+        return instancia
+
+
+class SharedAppSettings(metaclass=_SingletonPorSegmento):
+    __slots__ = ('_shm', '_buf', '_versao', '_valores')
+
+    def __init__(self, nome):
+        shm = shared_memory.SharedMemory(name=nome)
+        object.__setattr__(self, '_shm', shm)
+        object.__setattr__(self, '_buf', shm.buf.toreadonly())
+        object.__setattr__(self, '_versao', -1)
+        object.__setattr__(self, '_valores', {})
+
+    @property
+    def nome(self):
+        return self._shm.name
+
+    def _atualiza(self):
+        buf = self._buf
+        limite = None
+        while True:
+            versao, tamanho = _CABECALHO.unpack_from(buf, 0)
+            if versao == self._versao:
+                return
+            if not versao & 1:  # ímpar: escrita em andamento
+                inicio = _CABECALHO.size
+                dados = bytes(buf[inicio:inicio + tamanho])
+                if struct.unpack_from('q', buf, 0)[0] == versao:
+                    break
+            # O relógio só é consultado quando a leitura precisa repetir
+            if limite is None:
+                limite = monotonic() + TIMEOUT_LEITURA
+            elif monotonic() > limite:
+                raise TimeoutError(
+                    f'versão {versao} do segmento {self.nome!r} não '
+                    f'estabilizou em {TIMEOUT_LEITURA}s (publicador morto?)'
+                )
+        object.__setattr__(self, '_valores', json.loads(dados))
+        object.__setattr__(self, '_versao', versao)
+
+    @property
+    def versao(self):
+        self._atualiza()
+        return self._versao
+
+    def __getattr__(self, nome):
+        self._atualiza()
+        try:
+            return self._valores[nome]
+        except KeyError:
+            raise AttributeError(nome) from None
+
+    def __setattr__(self, nome, valor):
+        raise AttributeError(
+            'SharedAppSettings é somente leitura; use SettingsPublisher'
+        )
+
+    def close(self):
+        """Solta o segmento; um novo SharedAppSettings(nome) anexa de novo."""
+        self._buf.release()
+        self._shm.close()
+        type(self)._instances.pop(type(self), None)
+
+
+def _le_tema(nome):
+    settings = SharedAppSettings(nome)
+    return settings.versao, settings.tema, settings.font
+
+
+if __name__ == "__main__":
+    from multiprocessing import Pool
+
+    with SettingsPublisher(tema='O tema escuro', font='18px') as publisher:
+        with Pool(4) as pool:
+            print(pool.map(_le_tema, [publisher.nome] * 4))
+
+            publisher.publish(tema='O tema claro', font='16px')
+            print(pool.map(_le_tema, [publisher.nome] * 4))
+
+            pool.close()
+            pool.join()
+
+        # Um singleton por processo: outro segmento é recusado
+        settings = SharedAppSettings(publisher.nome)
+        try:
+            SharedAppSettings('outro_segmento')
+        except ValueError as erro:
+            print(erro)
+
+        # Publicador que morre no meio da escrita: versão ímpar para sempre
+        versao = struct.unpack_from('q', publisher._shm.buf, 0)[0]
+        struct.pack_into('q', publisher._shm.buf, 0, versao + 1)
+        TIMEOUT_LEITURA = 0.05
+        try:
+            settings.tema
+        except TimeoutError as erro:
+            print(erro)
+        settings.close()
@@ -1,15 +1,23 @@
 """
 O singleton tem a intenção de gerantir que uma classe tenha somente uma
 instância e fornece um ponto global de acesso para a mesma.
+
+A checagem é feita duas vezes (double-checked locking): sem lock no caminho
+comum e com lock só enquanto a instância ainda não existe, para que duas
+threads não criem duas instâncias.
 """
+from threading import Lock
 
 
 class AppSettings:
     _instance = None
+    _lock = Lock()
 
     def __new__(cls, *args, **kwargs):
         if not cls._instance:
-            cls._instance = super().__new__(cls, *args, **kwargs)
+            with cls._lock:
+                if not cls._instance:
+                    cls._instance = super().__new__(cls, *args, **kwargs)
 
         return cls._instance
 
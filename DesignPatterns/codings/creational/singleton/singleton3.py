@@ -19,15 +19,29 @@
 
 # p1 = Pessoa('Luiz')
 # print(p1.nome)
+from threading import Lock
 from typing import Dict
 
 
 class Singleton(type):
+    """
+    Thread-safe com double-checked locking: depois de criada a instância, o
+    caminho quente é só uma leitura de dict, sem lock. Na primeira criação,
+    cada classe usa seu próprio lock (uma classe lenta não trava as outras).
+    """
     _instances: Dict = {}
+    _locks: Dict = {}
 
     def __call__(cls, *args, **kwargs):
-        if cls not in cls._instances:
-            cls._instances[cls] = super().__call__(*args, **kwargs)
+        try:
+            return cls._instances[cls]
+        except KeyError:
+            pass
+
+        # setdefault é atômico: todas as threads recebem o mesmo lock
+        with Singleton._locks.setdefault(cls, Lock()):
+            if cls not in cls._instances:
+                cls._instances[cls] = super().__call__(*args, **kwargs)
         return cls._instances[cls]
 
 
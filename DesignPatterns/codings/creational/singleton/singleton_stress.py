@@ -0,0 +1,106 @@
+"""
+Teste de estresse e micro-benchmark dos singletons thread-safe.
+
+    . 64 threads, liberadas juntas por uma Barrier, pedem a instância de uma
+    classe recém-criada; todas precisam receber o mesmo objeto. A versão
+    ingênua (checa e depois cria) serve de controle e mostra a corrida.
+
+    . o custo de AppSettings() depois de criada a instância é comparado com
+    o da versão ingênua: o lock só entra no caminho de criação.
+"""
+import sys
+from threading import Barrier, Thread
+from time import sleep
+from timeit import repeat
+
+from . import singleton1, singleton3
+
+THREADS = 64
+
+
+class SingletonIngenuo(type):
+    _instances = {}
+
+    def __call__(cls, *args, **kwargs):
+        if cls not in cls._instances:
+            cls._instances[cls] = super().__call__(*args, **kwargs)
+        return cls._instances[cls]
+
+
+class AppSettingsIngenuo:
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if not cls._instance:
+            cls._instance = super().__new__(cls, *args, **kwargs)
+        return cls._instance
+
+
+def _init_lento(self):
+    sleep(0.001)  # alarga a janela da corrida
+
+
+def _instancias_distintas(fabrica):
+    barreira = Barrier(THREADS)
+    ids = set()
+
+    def trabalho():
+        barreira.wait()
+        ids.add(id(fabrica()))
+
+    threads = [Thread(target=trabalho) for _ in range(THREADS)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return len(ids)
+
+
+def estresse(rodadas=50):
+    casos = {
+        'Singleton (metaclasse)': lambda i: singleton3.Singleton(
+            f'S{i}', (), {'__init__': _init_lento}),
+        'SingletonIngenuo': lambda i: SingletonIngenuo(
+            f'I{i}', (), {'__init__': _init_lento}),
+        'AppSettings (__new__)': lambda i: type(
+            f'A{i}', (singleton1.AppSettings,), {'_instance': None}),
+        'AppSettingsIngenuo': lambda i: type(
+            f'N{i}', (AppSettingsIngenuo,), {'_instance': None}),
+    }
+    # Trocas de thread bem frequentes deixam a corrida mais provável
+    intervalo = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for nome, nova_classe in casos.items():
+            falhas = sum(
+                _instancias_distintas(nova_classe(i)) > 1
+                for i in range(rodadas)
+            )
+            print(f'{nome:>24}: {falhas}/{rodadas} rodadas com mais de '
+                  f'uma instância')
+    finally:
+        sys.setswitchinterval(intervalo)
+
+
+def benchmark(n=1_000_000):
+    class Metaclasse(metaclass=singleton3.Singleton):
+        pass
+
+    class MetaclasseIngenua(metaclass=SingletonIngenuo):
+        pass
+
+    casos = {
+        'singleton1.AppSettings': singleton1.AppSettings,
+        'AppSettingsIngenuo': AppSettingsIngenuo,
+        'singleton3.Singleton': Metaclasse,
+        'SingletonIngenuo': MetaclasseIngenua,
+    }
+    for nome, fabrica in casos.items():
+        fabrica()
+        melhor = min(repeat(fabrica, number=n, repeat=5))
+        print(f'{nome:>24}: {melhor / n * 1e9:.0f} ns por chamada')
+
+
+if __name__ == "__main__":
+    estresse()
+    benchmark()
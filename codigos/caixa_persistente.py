@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+"""
+caixa_persistente.py
+====================
+`CaixaPersistente`: variante persistente de `Caixa` (sequência imutável)
+implementada como *bit-partitioned trie* de largura 32, no estilo do
+PersistentVector do Clojure.
+
+- `append` e `set` custam O(log32 n) e devolvem uma NOVA caixa; a antiga
+  continua válida e compartilha todos os nós não alterados com a nova
+  (apenas o caminho até a folha modificada é copiado).
+- Os últimos (até 32) elementos ficam em um "tail" separado, então a
+  maioria dos `append` copia só essa pequena tupla.
+- Fatias contíguas (`cx[a:b]`) são visões O(1) sobre a mesma árvore;
+  fatias com passo diferente de 1 são materializadas.
+- A iteração percorre folha a folha (blocos de 32), sem descer a árvore
+  para cada índice.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Sequence
+from typing import Any, TypeVar, overload
+
+from typeannotations1 import Caixa
+
+T = TypeVar("T")
+
+_BITS = 5
+_LARGURA = 1 << _BITS
+_MASCARA = _LARGURA - 1
+
+# Um nó é uma tupla de filhos (nós internos) ou de valores (folhas)
+_No = tuple[Any, ...]
+
+
+def _agrupar(itens: Sequence[Any]) -> list[_No]:
+    return [tuple(itens[i:i + _LARGURA])
+            for i in range(0, len(itens), _LARGURA)]
+
+
+def _novo_caminho(nivel: int, no: _No) -> _No:
+    while nivel > 0:
+        no = (no,)
+        nivel -= _BITS
+    return no
+
+
+class CaixaPersistente(Sequence[T]):
+    """Sequência imutável com atualizações O(log32 n) e compartilhamento."""
+
+    __slots__ = ("_cnt", "_shift", "_raiz", "_tail")
+
+    def __init__(self, dados: Iterable[T] = ()) -> None:
+        itens = list(dados)
+        cnt = len(itens)
+        tailoff = 0 if cnt < _LARGURA else ((cnt - 1) >> _BITS) << _BITS
+
+        # Construção em bloco, de baixo para cima
+        nos = _agrupar(itens[:tailoff])
+        shift = _BITS
+        while len(nos) > _LARGURA:
+            nos = _agrupar(nos)
+            shift += _BITS
+
+        self._cnt = cnt
+        self._shift = shift
+        self._raiz: _No = tuple(nos)
+        self._tail: _No = tuple(itens[tailoff:])
+
+    @classmethod
+    def _de(cls, cnt: int, shift: int, raiz: _No,
+            tail: _No) -> CaixaPersistente[T]:
+        novo: CaixaPersistente[T] = cls.__new__(cls)
+        novo._cnt = cnt
+        novo._shift = shift
+        novo._raiz = raiz
+        novo._tail = tail
+        return novo
+
+    # -------------------------------------------------------------------
+    # Navegação
+    # -------------------------------------------------------------------
+    def _tailoff(self) -> int:
+        if self._cnt < _LARGURA:
+            return 0
+        return ((self._cnt - 1) >> _BITS) << _BITS
+
+    def _folha(self, i: int) -> _No:
+        """Bloco de 32 elementos que contém o índice `i`."""
+        if i >= self._tailoff():
+            return self._tail
+        no = self._raiz
+        for nivel in range(self._shift, 0, -_BITS):
+            no = no[(i >> nivel) & _MASCARA]
+        return no
+
+    def _normaliza(self, i: int) -> int:
+        if i < 0:
+            i += self._cnt
+        if not 0 <= i < self._cnt:
+            raise IndexError("índice fora do intervalo")
+        return i
+
+    def _iter_intervalo(self, ini: int, fim: int) -> Iterator[T]:
+        i = ini
+        while i < fim:
+            folha = self._folha(i)
+            base = i & ~_MASCARA
+            corte = min(fim - base, len(folha))
+            yield from folha[i - base:corte]
+            i = base + corte
+
+    # -------------------------------------------------------------------
+    # Sequence
+    # -------------------------------------------------------------------
+    def __len__(self) -> int:
+        return self._cnt
+
+    @overload
+    def __getitem__(self, i: int) -> T: ...
+    @overload
+    def __getitem__(self, i: slice) -> Sequence[T]: ...
+
+    def __getitem__(self, i: int | slice) -> T | Sequence[T]:
+        if isinstance(i, slice):
+            ini, fim, passo = i.indices(self._cnt)
+            if passo != 1:
+                return CaixaPersistente(self[j]
+                                        for j in range(ini, fim, passo))
+            return _FatiaPersistente(self, ini, max(fim - ini, 0))
+        i = self._normaliza(i)
+        return self._folha(i)[i & _MASCARA]  # type: ignore[no-any-return]
+
+    def __iter__(self) -> Iterator[T]:
+        return self._iter_intervalo(0, self._cnt)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({list(self)!r})"
+
+    # -------------------------------------------------------------------
+    # Atualizações persistentes
+    # -------------------------------------------------------------------
+    def append(self, valor: T) -> CaixaPersistente[T]:
+        cnt = self._cnt
+        if cnt - self._tailoff() < _LARGURA:
+            return self._de(cnt + 1, self._shift, self._raiz,
+                            self._tail + (valor,))
+
+        # Tail cheio: vira folha da árvore e um novo tail é iniciado
+        shift = self._shift
+        if (cnt >> _BITS) > (1 << shift):
+            raiz = (self._raiz, _novo_caminho(shift, self._tail))
+            shift += _BITS
+        else:
+            raiz = self._empurra_tail(shift, self._raiz, self._tail)
+        return self._de(cnt + 1, shift, raiz, (valor,))
+
+    def _empurra_tail(self, nivel: int, pai: _No, tail: _No) -> _No:
+        sub = ((self._cnt - 1) >> nivel) & _MASCARA
+        if nivel == _BITS:
+            inserir = tail
+        elif sub < len(pai):
+            inserir = self._empurra_tail(nivel - _BITS, pai[sub], tail)
+        else:
+            inserir = _novo_caminho(nivel - _BITS, tail)
+        return pai[:sub] + (inserir,) + pai[sub + 1:]
+
+    def set(self, i: int, valor: T) -> CaixaPersistente[T]:
+        i = self._normaliza(i)
+        if i >= self._tailoff():
+            j = i & _MASCARA
+            tail = self._tail[:j] + (valor,) + self._tail[j + 1:]
+            return self._de(self._cnt, self._shift, self._raiz, tail)
+        return self._de(self._cnt, self._shift,
+                        _atribui(self._shift, self._raiz, i, valor),
+                        self._tail)
+
+
+def _atribui(nivel: int, no: _No, i: int, valor: Any) -> _No:
+    sub = (i >> nivel) & _MASCARA
+    filho = valor if nivel == 0 else _atribui(nivel - _BITS, no[sub], i,
+                                              valor)
+    return no[:sub] + (filho,) + no[sub + 1:]
+
+
+class _FatiaPersistente(Sequence[T]):
+    """Visão contígua O(1) sobre uma CaixaPersistente (sem cópia)."""
+
+    __slots__ = ("_base", "_ini", "_len")
+
+    def __init__(self, base: CaixaPersistente[T], ini: int,
+                 tamanho: int) -> None:
+        self._base = base
+        self._ini = ini
+        self._len = tamanho
+
+    def __len__(self) -> int:
+        return self._len
+
+    @overload
+    def __getitem__(self, i: int) -> T: ...
+    @overload
+    def __getitem__(self, i: slice) -> Sequence[T]: ...
+
+    def __getitem__(self, i: int | slice) -> T | Sequence[T]:
+        if isinstance(i, slice):
+            ini, fim, passo = i.indices(self._len)
+            if passo != 1:
+                return CaixaPersistente(self[j]
+                                        for j in range(ini, fim, passo))
+            return _FatiaPersistente(self._base, self._ini + ini,
+                                     max(fim - ini, 0))
+        if i < 0:
+            i += self._len
+        if not 0 <= i < self._len:
+            raise IndexError("índice fora do intervalo")
+        return self._base[self._ini + i]
+
+    def __iter__(self) -> Iterator[T]:
+        return self._base._iter_intervalo(self._ini, self._ini + self._len)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({list(self)!r})"
+
+
+def _demo() -> None:
+    v0: CaixaPersistente[int] = CaixaPersistente(range(5))
+    v1 = v0.append(5)
+    v2 = v1.set(0, 100)
+    print(v0, v1, v2, sep="\n")
+    print(v2[1:4], list(v2[::2]))
+
+    # Conferência contra uma Caixa (tupla) em tamanhos que cruzam níveis
+    grande: CaixaPersistente[int] = CaixaPersistente()
+    for i in range(40_000):
+        grande = grande.append(i)
+    assert list(grande) == list(Caixa(range(40_000)))
+    assert list(CaixaPersistente(range(40_000))) == list(grande)
+    alterado = grande.set(12_345, -1)
+    assert grande[12_345] == 12_345 and alterado[12_345] == -1
+    assert list(grande[31:1_100]) == list(range(31, 1_100))
+
+
+def _benchmark(n: int = 100_000) -> None:
+    from time import perf_counter
+
+    t0 = perf_counter()
+    cx = Caixa[int](())
+    for i in range(n // 50):  # O(n²): apenas uma fração de n
+        cx = Caixa((*cx, i))
+    t_caixa = perf_counter() - t0
+
+    t0 = perf_counter()
+    cp: CaixaPersistente[int] = CaixaPersistente()
+    for i in range(n):
+        cp = cp.append(i)
+    t_pers = perf_counter() - t0
+
+    t0 = perf_counter()
+    sum(cp)
+    t_iter = perf_counter() - t0
+
+    print(f"Caixa (recria tupla) {n // 50} appends: {t_caixa:.3f}s")
+    print(f"CaixaPersistente {n} appends:     {t_pers:.3f}s")
+    print(f"CaixaPersistente iteração:           {t_iter:.3f}s")
+
+
+if __name__ == "__main__":
+    _demo()
+    _benchmark()
@@ -0,0 +1,300 @@
+# -*- coding: utf-8 -*-
+"""
+colunar.py
+==========
+Armazenamento colunar compacto gerado a partir de um `TypedDict`.
+
+`armazem_colunar(Credenciais)` inspeciona as anotações uma única vez e gera
+uma classe com uma coluna por campo:
+
+- int / float / bool -> `array` ("q" / "d" / "b"), 8 ou 1 byte por linha;
+- str                -> coluna de ids `array("I")` + tabela de strings
+                        internadas (cada valor distinto é guardado uma vez);
+- demais tipos       -> lista Python comum;
+- chaves `NotRequired` ausentes -> um bit zerado em um bitmap por coluna.
+
+O `extend` da classe gerada é compilado especificamente para os campos do
+TypedDict (sem laço genérico por campo). `linha(i)`/`loja[i]` devolve uma
+visão `Mapping` somente leitura, e `coluna(nome)` varre uma coluna inteira.
+
+Usamos `array` da biblioteca padrão: NumPy não é dependência deste
+repositório.
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from array import array
+from collections.abc import Iterable, Iterator, Mapping
+from typing import Any, ClassVar, get_args, get_origin, get_type_hints
+
+try:
+    from typing import NotRequired, Required
+except Exception:  # pragma: no cover
+    from typing_extensions import NotRequired, Required  # type: ignore
+
+from jsonl_stream import chaves_obrigatorias
+from typeannotations1 import Credenciais
+
+_AUSENTE: Any = object()
+
+# tipo Python -> (código do array, valor usado quando a chave está ausente)
+_NUMERICOS: dict[type, tuple[str, Any]] = {
+    bool: ("b", False),
+    int: ("q", 0),
+    float: ("d", 0.0),
+}
+
+
+class _Linha(Mapping[str, Any]):
+    """Visão de uma linha do armazém como dict somente leitura."""
+
+    __slots__ = ("_loja", "_i")
+
+    def __init__(self, loja: ArmazemColunar, i: int) -> None:
+        self._loja = loja
+        self._i = i
+
+    def __getitem__(self, chave: str) -> Any:
+        valor = self._loja._valor(chave, self._i)
+        if valor is _AUSENTE:
+            raise KeyError(chave)
+        return valor
+
+    def __iter__(self) -> Iterator[str]:
+        for campo in self._loja.campos:
+            if self._loja._presente(campo, self._i):
+                yield campo
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+class ArmazemColunar(ABC):
+    """
+    Base abstrata das classes geradas por `armazem_colunar`. Uma subclasse
+    que declara `campos`, `_tipos` e `_opcionais` ganha o `extend`
+    compilado em `__init_subclass__`.
+    """
+
+    campos: ClassVar[tuple[str, ...]] = ()
+    _tipos: ClassVar[dict[str, type]] = {}
+    _opcionais: ClassVar[frozenset[str]] = frozenset()
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        if "campos" in cls.__dict__ and "extend" not in cls.__dict__:
+            cls.extend = _gera_extend(  # type: ignore[method-assign]
+                cls.campos, cls._tipos, cls._opcionais)
+
+    def __init__(self, registros: Iterable[Mapping[str, Any]] = ()) -> None:
+        self._n = 0
+        self._colunas: dict[str, Any] = {}
+        self._bitmaps: dict[str, bytearray] = {}
+        self._strings: dict[str, list[str]] = {}
+        self._indices: dict[str, dict[str, int]] = {}
+        for campo in self.campos:
+            tipo = self._tipos[campo]
+            if tipo is str:
+                self._colunas[campo] = array("I")
+                self._strings[campo] = []
+                self._indices[campo] = {}
+            elif tipo in _NUMERICOS:
+                self._colunas[campo] = array(_NUMERICOS[tipo][0])
+            else:
+                self._colunas[campo] = []
+            if campo in self._opcionais:
+                self._bitmaps[campo] = bytearray()
+        self.extend(registros)
+
+    @abstractmethod
+    def extend(self, registros: Iterable[Mapping[str, Any]]) -> None:
+        """Acrescenta os registros; gerado em `__init_subclass__`."""
+
+    def append(self, registro: Mapping[str, Any]) -> None:
+        self.extend((registro,))
+
+    def _trunca(self, n: int) -> None:
+        """Desfaz uma linha incompleta (ex.: chave obrigatória ausente)."""
+        for coluna in self._colunas.values():
+            del coluna[n:]
+        for bitmap in self._bitmaps.values():
+            del bitmap[(n + 7) >> 3:]
+            if n & 7:
+                bitmap[-1] &= (1 << (n & 7)) - 1
+        self._n = n
+
+    # -------------------------------------------------------------------
+    # Leitura
+    # -------------------------------------------------------------------
+    def __len__(self) -> int:
+        return self._n
+
+    def _presente(self, campo: str, i: int) -> bool:
+        bitmap = self._bitmaps.get(campo)
+        return bitmap is None or bool(bitmap[i >> 3] >> (i & 7) & 1)
+
+    def _valor(self, campo: str, i: int) -> Any:
+        if not self._presente(campo, i):
+            return _AUSENTE
+        bruto = self._colunas[campo][i]
+        tipo = self._tipos[campo]
+        if tipo is str:
+            return self._strings[campo][bruto]
+        if tipo is bool:
+            return bool(bruto)
+        return bruto
+
+    def linha(self, i: int) -> Mapping[str, Any]:
+        if i < 0:
+            i += self._n
+        if not 0 <= i < self._n:
+            raise IndexError("índice fora do intervalo")
+        return _Linha(self, i)
+
+    __getitem__ = linha
+
+    def __iter__(self) -> Iterator[Mapping[str, Any]]:
+        return (_Linha(self, i) for i in range(self._n))
+
+    def coluna(self, campo: str) -> Iterator[Any]:
+        """Varre a coluna; linhas sem a chave produzem None."""
+        if campo not in self._tipos:
+            raise KeyError(campo)
+        valores: Iterable[Any] = self._colunas[campo]
+        tipo = self._tipos[campo]
+        if tipo is str:
+            valores = map(self._strings[campo].__getitem__, valores)
+        elif tipo is bool:
+            valores = map(bool, valores)
+        bitmap = self._bitmaps.get(campo)
+        if bitmap is None:
+            return iter(valores)
+        return (v if bitmap[i >> 3] >> (i & 7) & 1 else None
+                for i, v in enumerate(valores))
+
+
+def _gera_extend(campos: tuple[str, ...], tipos: dict[str, type],
+                 opcionais: frozenset[str]) -> Any:
+    """Compila um `extend` específico para os campos do TypedDict."""
+    ambiente: dict[str, Any] = {"_AUSENTE": _AUSENTE}
+    prep = ["    n = self._n"]
+    corpo = []
+    bitmaps = [f"p{k}" for k, c in enumerate(campos) if c in opcionais]
+
+    for k, campo in enumerate(campos):
+        tipo = tipos[campo]
+        prep.append(f"    a{k} = self._colunas[{campo!r}].append")
+        if campo in opcionais:
+            padrao = "''" if tipo is str else repr(
+                _NUMERICOS.get(tipo, ("", None))[1])
+            prep.append(f"    p{k} = self._bitmaps[{campo!r}]")
+            corpo += [
+                f"            v = r.get({campo!r}, _AUSENTE)",
+                "            if v is _AUSENTE:",
+                f"                v = {padrao}",
+                "            else:",
+                f"                p{k}[n >> 3] |= 1 << (n & 7)",
+            ]
+        else:
+            corpo.append(f"            v = r[{campo!r}]")
+        if tipo is str:
+            prep.append(f"    d{k} = self._indices[{campo!r}]")
+            prep.append(f"    s{k} = self._strings[{campo!r}]")
+            corpo += [
+                f"            j = d{k}.get(v)",
+                "            if j is None:",
+                f"                j = d{k}[v] = len(s{k})",
+                f"                s{k}.append(v)",
+                f"            a{k}(j)",
+            ]
+        else:
+            corpo.append(f"            a{k}(v)")
+
+    linhas = ["def extend(self, registros):", *prep, "    try:",
+              "        for r in registros:"]
+    if bitmaps:
+        linhas.append("            if not n & 7:")
+        linhas += [f"                {p}.append(0)" for p in bitmaps]
+    linhas += [*corpo, "            n += 1",
+               "    except BaseException:",
+               "        self._trunca(n)",
+               "        raise",
+               "    self._n = n"]
+    exec("\n".join(linhas), ambiente)
+    return ambiente["extend"]
+
+
+def armazem_colunar(tipo: type) -> type[ArmazemColunar]:
+    """Gera uma classe de armazém colunar para o TypedDict `tipo`."""
+    dicas = get_type_hints(tipo, include_extras=True)
+    tipos: dict[str, type] = {}
+    for campo, dica in dicas.items():
+        if get_origin(dica) in (Required, NotRequired):
+            dica = get_args(dica)[0]
+        tipos[campo] = dica if dica in (str, *_NUMERICOS) else object
+
+    campos = tuple(dicas)
+    opcionais = frozenset(campos) - chaves_obrigatorias(tipo)
+    return type(f"{tipo.__name__}Colunar", (ArmazemColunar,), {
+        "campos": campos,
+        "_tipos": tipos,
+        "_opcionais": opcionais,
+    })
+
+
+# -----------------------------------------------------------------------------
+# Demonstração e benchmark de memória (lista de dicts × colunar)
+# -----------------------------------------------------------------------------
+
+def _registros(n: int) -> Iterator[Credenciais]:
+    for j in range(n):
+        reg: Credenciais = {"user": f"user{j % 50_000}",
+                            "password": f"senha{j % 1_000}"}
+        if j % 3 == 0:
+            reg["otp"] = f"{j % 1_000_000:06d}"
+        if j % 2 == 0:
+            reg["remember_me"] = j % 4 == 0
+        yield reg
+
+
+def _benchmark(n: int = 500_000) -> None:
+    import tracemalloc
+
+    tracemalloc.start()
+    lista = list(_registros(n))
+    mem_lista = tracemalloc.get_traced_memory()[0]
+    del lista
+
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    loja = armazem_colunar(Credenciais)(_registros(n))
+    mem_loja = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+
+    print(f"{len(loja)} linhas")
+    print(f"lista de dicts: {mem_lista / 2**20:.1f} MB")
+    print(f"colunar:        {mem_loja / 2**20:.1f} MB")
+
+
+def _demo() -> None:
+    CredenciaisColunar = armazem_colunar(Credenciais)
+    loja = CredenciaisColunar(_registros(5))
+    print(CredenciaisColunar.__name__, len(loja))
+    print(loja[0], loja[1], dict(loja[2]))
+    print(list(loja.coluna("otp")))
+    try:
+        loja.append({"user": "sem senha"})  # type: ignore[typeddict-item]
+    except KeyError as ex:
+        print("rejeitado:", ex, "- linhas:", len(loja))
+
+
+if __name__ == "__main__":
+    import sys
+
+    _demo()
+    # Ex.: `python colunar.py 5000000` para o cenário de 5M linhas
+    _benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 500_000)
@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+"""
+jsonl_stream.py
+===============
+Leitura em streaming de arquivos JSONL (um objeto JSON por linha) para
+registros tipados com `TypedDict` (ex.: `Credenciais`).
+
+- `ler_jsonl`: lê com um buffer de tamanho fixo e decodifica linha a linha,
+  então a memória não cresce com o tamanho do arquivo.
+- `ler_jsonl_lotes`: o mesmo, agrupando em listas de até `tamanho` registros.
+- `ler_jsonl_paralelo`: divide o arquivo em faixas de bytes alinhadas em
+  quebras de linha e decodifica cada faixa em um pool de processos, com no
+  máximo `2 * processos` faixas em voo (memória limitada).
+
+TypedDict não existe em runtime além de um dict; com `validar=True` apenas
+as chaves obrigatórias são conferidas.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, TypeVar, cast, get_origin, get_type_hints
+
+try:
+    from typing import NotRequired, Required
+except Exception:  # pragma: no cover
+    from typing_extensions import NotRequired, Required  # type: ignore
+
+from typeannotations1 import Credenciais
+
+TD = TypeVar("TD")
+
+BUFFER_PADRAO = 1 << 20        # 1 MiB por leitura
+FAIXA_PADRAO = 16 << 20        # 16 MiB por tarefa no modo paralelo
+
+# Chamar o decoder direto evita as camadas de json.loads a cada linha
+_loads = json.JSONDecoder().decode
+
+
+def chaves_obrigatorias(tipo: type) -> frozenset[str]:
+    """Chaves obrigatórias de um TypedDict.
+
+    Com `from __future__ import annotations` (caso de `Credenciais`), o
+    `__required_keys__` do 3.11 não enxerga `Required[...]`; por isso as
+    anotações são resolvidas com `get_type_hints`.
+    """
+    dicas = get_type_hints(tipo, include_extras=True)
+    total = getattr(tipo, "__total__", True)
+    return frozenset(
+        k for k, dica in dicas.items()
+        if get_origin(dica) is Required
+        or (total and get_origin(dica) is not NotRequired)
+    )
+
+
+def _valida(registro: Any, obrigatorias: frozenset[str], onde: str) -> None:
+    if not isinstance(registro, dict):
+        raise ValueError(f"{onde}: esperado objeto JSON")
+    faltando = obrigatorias - registro.keys()
+    if faltando:
+        raise ValueError(f"{onde}: chaves ausentes {sorted(faltando)}")
+
+
+def _linhas(caminho: str, buffer: int, ini: int = 0,
+            fim: int | None = None) -> Iterator[str]:
+    """Linhas (sem o '\\n') do intervalo [ini, fim) lidas em blocos fixos.
+
+    Cada bloco é decodificado de uma vez só (até a última quebra de linha),
+    o que sai bem mais barato que decodificar linha a linha.
+    """
+    with open(caminho, "rb", buffering=0) as f:
+        f.seek(ini)
+        restante = -1 if fim is None else fim - ini
+        resto = b""
+        while restante:
+            bloco = f.read(buffer if restante < 0 else min(buffer, restante))
+            if not bloco:
+                break
+            if restante > 0:
+                restante -= len(bloco)
+            dados = resto + bloco
+            corte = dados.rfind(b"\n") + 1
+            resto = dados[corte:]
+            if corte:
+                yield from dados[:corte].decode("utf-8").split("\n")[:-1]
+        if resto:
+            yield resto.decode("utf-8")
+
+
+def ler_jsonl(
+        caminho: str,
+        tipo: type[TD] = Credenciais,  # type: ignore[assignment]
+        *,
+        buffer: int = BUFFER_PADRAO,
+        validar: bool = True,
+) -> Iterator[TD]:
+    obrigatorias = chaves_obrigatorias(tipo)
+    loads = _loads
+    for n, linha in enumerate(_linhas(caminho, buffer), 1):
+        if not linha.strip():
+            continue
+        registro = loads(linha)
+        if validar:
+            _valida(registro, obrigatorias, f"linha {n}")
+        yield cast(TD, registro)
+
+
+def ler_jsonl_lotes(
+        caminho: str,
+        tamanho: int,
+        tipo: type[TD] = Credenciais,  # type: ignore[assignment]
+        **kwargs: Any,
+) -> Iterator[list[TD]]:
+    if tamanho < 1:
+        raise ValueError("tamanho deve ser >= 1")
+    lote: list[TD] = []
+    for registro in ler_jsonl(caminho, tipo, **kwargs):
+        lote.append(registro)
+        if len(lote) == tamanho:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
+# -----------------------------------------------------------------------------
+# Modo paralelo: faixas de bytes alinhadas em '\n'
+# -----------------------------------------------------------------------------
+
+def faixas(caminho: str, tamanho: int = FAIXA_PADRAO) -> list[tuple[int, int]]:
+    """Divide o arquivo em faixas [ini, fim) que começam no início de linha."""
+    total = os.path.getsize(caminho)
+    limites = [0]
+    with open(caminho, "rb") as f:
+        pos = tamanho
+        while pos < total:
+            f.seek(pos)
+            f.readline()  # avança até o fim da linha corrente
+            pos = f.tell()
+            if pos >= total:
+                break
+            limites.append(pos)
+            pos += tamanho
+    limites.append(total)
+    return list(zip(limites, limites[1:]))
+
+
+def _decodifica_faixa(caminho: str, ini: int, fim: int,
+                      obrigatorias: frozenset[str],
+                      buffer: int) -> list[Any]:
+    loads = _loads
+    registros = []
+    for linha in _linhas(caminho, buffer, ini, fim):
+        if not linha.strip():
+            continue
+        registro = loads(linha)
+        if obrigatorias:
+            # O número da linha não é conhecido aqui, só o byte da faixa
+            _valida(registro, obrigatorias, f"faixa no byte {ini}")
+        registros.append(registro)
+    return registros
+
+
+def ler_jsonl_paralelo(
+        caminho: str,
+        tipo: type[TD] = Credenciais,  # type: ignore[assignment]
+        *,
+        processos: int | None = None,
+        faixa: int = FAIXA_PADRAO,
+        buffer: int = BUFFER_PADRAO,
+        validar: bool = True,
+) -> Iterator[list[TD]]:
+    """Lotes (um por faixa), na ordem do arquivo."""
+    obrigatorias = chaves_obrigatorias(tipo) if validar else frozenset()
+    processos = processos or os.cpu_count() or 1
+    limite = 2 * processos
+    with ProcessPoolExecutor(processos) as pool:
+        pendentes: deque[Future[list[Any]]] = deque()
+        for ini, fim in faixas(caminho, faixa):
+            if len(pendentes) >= limite:
+                yield pendentes.popleft().result()
+            pendentes.append(pool.submit(_decodifica_faixa, caminho, ini,
+                                         fim, obrigatorias, buffer))
+        while pendentes:
+            yield pendentes.popleft().result()
+
+
+# -----------------------------------------------------------------------------
+# Benchmark: arquivo gerado, pico de RSS e MB/s
+# -----------------------------------------------------------------------------
+
+def _gera_arquivo(caminho: str, mb: int) -> None:
+    alvo = mb << 20
+    with open(caminho, "w", encoding="utf-8") as f:
+        i = 0
+        while f.tell() < alvo:
+            linhas = []
+            for j in range(i, i + 10_000):
+                reg: Credenciais = {"user": f"user{j}",
+                                    "password": f"{j:032x}"}
+                if j % 3 == 0:
+                    reg["otp"] = f"{j % 1_000_000:06d}"
+                if j % 2 == 0:
+                    reg["remember_me"] = True
+                linhas.append(json.dumps(reg))
+            f.write("\n".join(linhas) + "\n")
+            i += 10_000
+
+
+def _pico_rss_mb() -> float:
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - Windows
+        return float("nan")
+    proprio = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    filhos = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return max(proprio, filhos) / 1024  # ru_maxrss em KiB no Linux
+
+
+def _benchmark(mb: int = 64) -> None:
+    import tempfile
+    from time import perf_counter
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "credenciais.jsonl")
+        _gera_arquivo(caminho, mb)
+        tamanho_mb = os.path.getsize(caminho) / (1 << 20)
+        print(f"arquivo: {tamanho_mb:.0f} MB, "
+              f"RSS após gerar: {_pico_rss_mb():.0f} MB")
+
+        t0 = perf_counter()
+        n = sum(1 for _ in ler_jsonl(caminho))
+        dt = perf_counter() - t0
+        print(f"sequencial: {n} registros, {tamanho_mb / dt:.1f} MB/s, "
+              f"pico RSS {_pico_rss_mb():.0f} MB")
+
+        t0 = perf_counter()
+        n = sum(len(lote) for lote in ler_jsonl_paralelo(caminho))
+        dt = perf_counter() - t0
+        print(f"paralelo:   {n} registros, {tamanho_mb / dt:.1f} MB/s, "
+              f"pico RSS (maior processo) {_pico_rss_mb():.0f} MB")
+
+
+if __name__ == "__main__":
+    import sys
+
+    # Ex.: `python jsonl_stream.py 2048` para o cenário de 2 GB
+    _benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 64)
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""
+pipeline.py
+===========
+Pipeline preguiçoso e tipado sobre geradores (`contagem`, `flat`, ...).
+
+Encadear geradores (`map`/`filter` aninhados) custa uma troca de frame por
+item e por estágio. Aqui, estágios consecutivos sem estado (map/filter) são
+fundidos em um único laço gerado em tempo de construção, de modo que cada
+item atravessa todos eles dentro do mesmo frame:
+
+    Pipeline(contagem(10)).map(f).filter(p).batch(3).window(2)
+
+- `map`/`filter` são fundidos entre si;
+- `batch`/`window` têm estado e encerram o trecho fundido atual;
+- nada é executado até que o pipeline seja iterado.
+
+Execute `python pipeline.py` para ver a demonstração e o benchmark.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from itertools import islice
+from typing import Any, Generic, Literal, TypeVar
+
+from typeannotations1 import contagem, flat
+
+T = TypeVar("T")
+U = TypeVar("U")
+
+_Op = tuple[Literal["map", "filter"], Callable[[Any], Any]]
+
+
+def _fundir(ops: list[_Op]) -> Callable[[Iterable[Any]], Iterator[Any]]:
+    """Gera um único gerador que aplica todos os `ops` no mesmo laço."""
+    ambiente: dict[str, Any] = {}
+    linhas = ["def _fundido(src):", "    for x in src:"]
+    for i, (tipo, fn) in enumerate(ops):
+        ambiente[f"f{i}"] = fn
+        if tipo == "map":
+            linhas.append(f"        x = f{i}(x)")
+        else:
+            linhas.append(f"        if not f{i}(x):")
+            linhas.append("            continue")
+    linhas.append("        yield x")
+    exec("\n".join(linhas), ambiente)
+    return ambiente["_fundido"]  # type: ignore[no-any-return]
+
+
+def _batch(src: Iterable[T], n: int) -> Iterator[list[T]]:
+    it = iter(src)
+    while lote := list(islice(it, n)):
+        yield lote
+
+
+def _window(src: Iterable[T], k: int) -> Iterator[tuple[T, ...]]:
+    janela: deque[T] = deque(maxlen=k)
+    for x in src:
+        janela.append(x)
+        if len(janela) == k:
+            yield tuple(janela)
+
+
+class Pipeline(Generic[T]):
+    """Builder imutável: cada estágio devolve um novo Pipeline."""
+
+    __slots__ = ("_src", "_estagios", "_ops")
+
+    def __init__(self, src: Iterable[T]) -> None:
+        self._src = src
+        # estágios já "fechados" (com estado) e ops sem estado pendentes
+        self._estagios: tuple[Callable[[Iterable[Any]], Iterator[Any]],
+                              ...] = ()
+        self._ops: tuple[_Op, ...] = ()
+
+    def _com(
+            self,
+            estagios: tuple[Callable[[Iterable[Any]], Iterator[Any]], ...],
+            ops: tuple[_Op, ...],
+    ) -> Pipeline[Any]:
+        novo: Pipeline[Any] = Pipeline(self._src)
+        novo._estagios = estagios
+        novo._ops = ops
+        return novo
+
+    def _fechar(self) -> tuple[Callable[[Iterable[Any]], Iterator[Any]], ...]:
+        if not self._ops:
+            return self._estagios
+        return (*self._estagios, _fundir(list(self._ops)))
+
+    def map(self, fn: Callable[[T], U]) -> Pipeline[U]:
+        return self._com(self._estagios, (*self._ops, ("map", fn)))
+
+    def filter(self, pred: Callable[[T], bool]) -> Pipeline[T]:
+        return self._com(self._estagios, (*self._ops, ("filter", pred)))
+
+    def batch(self, n: int) -> Pipeline[list[T]]:
+        if n < 1:
+            raise ValueError("n deve ser >= 1")
+        return self._com(
+            (*self._fechar(), lambda src: _batch(src, n)), ()
+        )
+
+    def window(self, k: int) -> Pipeline[tuple[T, ...]]:
+        if k < 1:
+            raise ValueError("k deve ser >= 1")
+        return self._com(
+            (*self._fechar(), lambda src: _window(src, k)), ()
+        )
+
+    def __iter__(self) -> Iterator[T]:
+        it: Iterable[Any] = self._src
+        for estagio in self._fechar():
+            it = estagio(it)
+        return iter(it)
+
+
+# -----------------------------------------------------------------------------
+# Demonstração e benchmark (5 estágios: fundido × geradores aninhados)
+# -----------------------------------------------------------------------------
+
+def _dobra(x: int) -> int:
+    return x * 2
+
+
+def _par(x: int) -> bool:
+    return x % 4 == 0
+
+
+def _soma1(x: int) -> int:
+    return x + 1
+
+
+def _nao_mult3(x: int) -> bool:
+    return x % 3 != 0
+
+
+def _quadrado(x: int) -> int:
+    return x * x
+
+
+def _aninhado(n: int) -> Iterator[int]:
+    g1 = (_dobra(x) for x in contagem(n))
+    g2 = (x for x in g1 if _par(x))
+    g3 = (_soma1(x) for x in g2)
+    g4 = (x for x in g3 if _nao_mult3(x))
+    return (_quadrado(x) for x in g4)
+
+
+def _fundido(n: int) -> Pipeline[int]:
+    return (
+        Pipeline[int](contagem(n))
+        .map(_dobra).filter(_par).map(_soma1).filter(_nao_mult3)
+        .map(_quadrado)
+    )
+
+
+def _benchmark(n: int = 1_000_000, repeticoes: int = 3) -> None:
+    from timeit import repeat
+
+    assert list(_aninhado(1000)) == list(_fundido(1000))
+    t_aninhado = min(repeat(lambda: sum(_aninhado(n)), number=1,
+                            repeat=repeticoes))
+    t_fundido = min(repeat(lambda: sum(_fundido(n)), number=1,
+                           repeat=repeticoes))
+    print(f"geradores aninhados: {t_aninhado:.3f}s")
+    print(f"pipeline fundido:    {t_fundido:.3f}s "
+          f"({t_aninhado / t_fundido:.2f}x)")
+
+
+def _demo() -> None:
+    p = Pipeline[int](flat([[1, 2, 3], [4, 5, 6, 7]]))
+    print(list(p.map(lambda x: x * 10).filter(lambda x: x > 20).batch(2)))
+    print(list(Pipeline[int](contagem(6)).window(3)))
+
+
+if __name__ == "__main__":
+    _demo()
+    _benchmark()
@@ -22,10 +22,13 @@ Documentação oficial: https://docs.python.org/3/library/typing.html
 
 from __future__ import annotations
 
+import asyncio
+import inspect
+from collections import deque
 # Prefira collections.abc para ABCs de containers/iteradores/geradores.
 from collections.abc import (AsyncGenerator, AsyncIterable, AsyncIterator,
-                             Callable, Generator, Iterable, Iterator, Mapping,
-                             MutableMapping, Sequence)
+                             Awaitable, Callable, Generator, Iterable,
+                             Iterator, Mapping, MutableMapping, Sequence)
 from contextlib import asynccontextmanager, contextmanager
 from dataclasses import dataclass
 from typing import (TYPE_CHECKING, Annotated, Any, ClassVar, Concatenate,
@@ -178,6 +181,78 @@ def mapear(func: Callable[[T], U], itens: Iterable[T]) -> list[U]:
     return [func(x) for x in itens]
 
 
+async def _aiterar(itens: Iterable[T] | AsyncIterable[T]) -> AsyncIterator[T]:
+    """Unifica iteráveis síncronos e assíncronos em um AsyncIterator."""
+    if isinstance(itens, AsyncIterable):
+        async for x in itens:
+            yield x
+    else:
+        for x in itens:
+            yield x
+
+
+async def amapear(
+        func: Callable[[T], Awaitable[U]] | Callable[[T], U],
+        itens: Iterable[T] | AsyncIterable[T],
+        limit: int = 10,
+        *,
+        ordenado: bool = True,
+        executor: bool = False,
+) -> AsyncGenerator[U, None]:
+    """Análogo assíncrono de `mapear`, com no máximo `limit` chamadas em voo.
+
+    - `ordenado=True` emite na ordem de entrada; False, na ordem de término.
+    - `executor=True` envia callables síncronos ao executor padrão do loop
+      (funções e objetos com `__call__` assíncrono continuam no loop).
+    Ao interromper o consumo (break/aclose), as tarefas pendentes são
+    canceladas e aguardadas.
+    """
+    if limit < 1:
+        raise ValueError("limit deve ser >= 1")
+
+    loop = asyncio.get_running_loop()
+    assincrono = inspect.iscoroutinefunction(func) or \
+        inspect.iscoroutinefunction(getattr(func, "__call__", None))
+    sincrono = executor and not assincrono
+
+    async def chama(x: T) -> U:
+        r = await loop.run_in_executor(None, func, x) if sincrono else func(x)
+        if inspect.isawaitable(r):
+            return cast(U, await r)
+        return cast(U, r)
+
+    fila: deque[asyncio.Task[U]] = deque()
+    em_voo: set[asyncio.Task[U]] = set()
+    try:
+        async for x in _aiterar(itens):
+            if ordenado:
+                if len(fila) >= limit:
+                    yield await fila.popleft()
+                fila.append(asyncio.ensure_future(chama(x)))
+            else:
+                if len(em_voo) >= limit:
+                    prontas, em_voo = await asyncio.wait(
+                        em_voo, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for t in prontas:
+                        yield t.result()
+                em_voo.add(asyncio.ensure_future(chama(x)))
+
+        while fila:
+            yield await fila.popleft()
+        while em_voo:
+            prontas, em_voo = await asyncio.wait(
+                em_voo, return_when=asyncio.FIRST_COMPLETED
+            )
+            for t in prontas:
+                yield t.result()
+    finally:
+        pendentes = (*fila, *em_voo)
+        for t in pendentes:
+            t.cancel()
+        await asyncio.gather(*pendentes, return_exceptions=True)
+
+
 # -----------------------------------------------------------------------------
 # 5) Callable, overload, ParamSpec, Concatenate
 # -----------------------------------------------------------------------------
@@ -342,6 +417,39 @@ def _demo() -> None:
     # Mapear
     print(mapear(lambda z: z * 10, [1, 2, 3]))
 
+    # Mapear assíncrono (I/O simulado, no máximo 2 em voo)
+    async def dobra_lento(z: int) -> int:
+        await asyncio.sleep(0.01 * (3 - z))
+        return z * 2
+
+    async def coleta() -> tuple[list[int], list[int]]:
+        em_ordem = [r async for r in amapear(dobra_lento, [1, 2, 3], 2)]
+        no_termino = [
+            r async for r in amapear(dobra_lento, gen_async(3), 3,
+                                     ordenado=False)
+        ]
+        return em_ordem, no_termino
+
+    print(asyncio.run(coleta()))
+
+    # Objeto com __call__ assíncrono não vai ao executor; um break cancela
+    # e aguarda as tarefas que ainda estão em voo
+    class Triplica:
+        async def __call__(self, z: int) -> int:
+            await asyncio.sleep(0.01 * z)
+            return z * 3
+
+    async def interrompe() -> list[int]:
+        saida = []
+        gen = amapear(Triplica(), range(5), 3, executor=True)
+        async for r in gen:
+            saida.append(r)
+            break
+        await gen.aclose()
+        return saida
+
+    print(asyncio.run(interrompe()))
+
     # Overload
     _ = carregar(__file__)           # bytes
     _ = carregar(__file__, texto=True)  # str